@@ -1,38 +1,669 @@
 import os
-import certifi
+import sys
+import time
+import argparse
+import bisect
+import shutil
+import tempfile
 import warnings
 from datetime import datetime
 import calendar
 import glob
-import pandas as pd
-from math import exp
-import requests
+import json
+import hashlib
+import importlib
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from math import exp, radians, sin, cos, asin, sqrt, ceil
 import csv
 from io import BytesIO
-from PIL import Image, ImageTk
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 
+class LazyModule:
+    # Stands in for a heavy module until first attribute access imports it, so the window
+    # can appear before pandas/numpy/requests have loaded. Resolved attributes are cached.
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+    def __getattr__(self, attr):
+        value = getattr(importlib.import_module(self._name), attr)
+        self.__dict__[attr] = value
+        return value
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+requests = LazyModule("requests")
+
 # OpenWeather API Key (replace with your own if needed)
 OPENWEATHER_API_KEY = "8ab060ad06b4fa2accd41a4f8e646025"
 
+PLANT_DATABASE_FOLDER = '/Users/michael_z/Downloads/Plant Database'
+REPORT_EXPORT_PATH = '/Users/michael_z/Downloads/location_data_report.csv'
+
+# Endpoints are module-level so they can be pointed at a local stub server.
+NASA_POWER_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
+OPEN_METEO_ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+OPENWEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+SOILGRIDS_URL = "https://rest.isric.org/soilgrids/v2.0/properties/query"
+OPENTOPODATA_URL = "https://api.opentopodata.org/v1/srtm90m"
+SOIL_PROPERTIES = ["phh2o", "soc", "clay", "silt", "sand", "cec", "cfvo"]
+OPENTOPODATA_BATCH_SIZE = 100
+
+HTTP_TIMEOUT = 10
+MAX_REQUESTS_PER_HOST = 8
+FETCH_WORKERS = 32
+LOCATION_REPORT_DEADLINE = 30
+CLIMATE_LATENCY_BUDGET = 20
+
+# Response cache: coordinates are snapped to CACHE_GRID_DEGREES before keying, and
+# a TTL of None means the entry never expires (soil, terrain, closed climate months).
+RESPONSE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".gardener_cache", "responses.sqlite")
+CACHE_GRID_DEGREES = 0.01
+CACHE_MEMORY_ENTRIES = 4096
+CACHE_TTLS = {
+    "soil": None,
+    "terrain": None,
+    "climate_closed": None,
+    "climate_open": 3600,
+    "weather": 600
+}
+
+# ----------------------- Instrumentation -----------------------
+
+class _NullStage:
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_STAGE = _NullStage()
+_tracer = None
+
+class _Stage:
+    __slots__ = ("tracer", "name", "fields", "start")
+    def __init__(self, tracer, name, fields):
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, time.perf_counter() - self.start, self.fields, exc_type)
+        return False
+
+class Tracer:
+    # Aggregates stage timings and counters; with a path, every event is also appended
+    # to a JSON-lines trace as it happens.
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.timers = {}
+        self.counters = {}
+        self.file = open(path, "a", buffering=1) if path else None
+    def stage(self, name, fields):
+        return _Stage(self, name, fields)
+    def record(self, name, seconds, fields, exc_type=None):
+        with self.lock:
+            timer = self.timers.setdefault(name, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+        event = {"stage": name, "ms": round(seconds * 1000, 3), **fields}
+        if exc_type is not None:
+            event["error"] = exc_type.__name__
+        self.write(event)
+    def count(self, name, n, fields):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+        self.write({"counter": name, "n": n, **fields})
+    def write(self, event):
+        if self.file is None:
+            return
+        line = json.dumps({"ts": round(time.time(), 6), "thread": threading.current_thread().name, **event},
+                          default=str)
+        with self.lock:
+            self.file.write(line + "\n")
+    def summary(self):
+        with self.lock:
+            stages = {name: {"count": n, "total_ms": total * 1000, "mean_ms": total * 1000 / n, "max_ms": peak * 1000}
+                      for name, (n, total, peak) in self.timers.items()}
+            return {"stages": stages, "counters": dict(self.counters)}
+    def report(self):
+        summary = self.summary()
+        print("📊 Stage timings:")
+        for name, timing in sorted(summary["stages"].items(), key=lambda item: -item[1]["total_ms"]):
+            print(f"  {name}: {timing['count']}x, total {timing['total_ms']:.1f} ms, "
+                  f"mean {timing['mean_ms']:.2f} ms, max {timing['max_ms']:.1f} ms")
+        if summary["counters"]:
+            print("📊 Counters:")
+            for name, value in sorted(summary["counters"].items()):
+                print(f"  {name}: {value}")
+        cache = _response_cache
+        if cache is not None:
+            cache.report()
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def enable_tracing(path=None):
+    global _tracer
+    disable_tracing()
+    _tracer = Tracer(path)
+    return _tracer
+
+def disable_tracing():
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+    return tracer
+
+def trace_stage(name, **fields):
+    # With tracing off this is one global read returning a shared no-op context manager,
+    # cheap enough to leave around every hot call.
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_STAGE
+    return tracer.stage(name, fields)
+
+def trace_count(name, n=1, **fields):
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(name, n, fields)
+
+@contextmanager
+def profile_capture(output_dir, top=30):
+    # Opt-in: cProfile of the calling thread plus tracemalloc allocation sites.
+    import cProfile, pstats, tracemalloc  # local import
+    os.makedirs(output_dir, exist_ok=True)
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        profiler.dump_stats(os.path.join(output_dir, "profile.pstats"))
+        with open(os.path.join(output_dir, "profile.txt"), "w") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(top)
+        with open(os.path.join(output_dir, "allocations.txt"), "w") as f:
+            f.write(f"Traced memory: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB\n")
+            for stat in snapshot.statistics("lineno")[:top]:
+                f.write(f"{stat}\n")
+        print(f"📊 Profile written to {output_dir} (peak traced memory {peak / 1e6:.1f} MB)")
+
+# ----------------------- HTTP Fetch Layer -----------------------
+
+_http_session = None
+_fetch_executor = None
+_host_semaphores = {}
+_fetch_lock = threading.Lock()
+# Per-thread count of failed requests, so a caller can tell an HTTP error from an empty answer.
+_http_errors = threading.local()
+
+def get_http_session():
+    # One pooled session so repeated calls to the same host reuse TCP/TLS connections.
+    global _http_session
+    with _fetch_lock:
+        if _http_session is None:
+            from requests.adapters import HTTPAdapter  # local import
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=FETCH_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+def get_fetch_executor():
+    global _fetch_executor
+    with _fetch_lock:
+        if _fetch_executor is None:
+            _fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="fetch")
+        return _fetch_executor
+
+def host_semaphore(url):
+    host = urlsplit(url).netloc
+    with _fetch_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+        return _host_semaphores[host]
+
+# How often a cancellable wait wakes up to look at its cancel token.
+CANCEL_POLL_SECONDS = 0.1
+
+class FetchCancelled(Exception):
+    pass
+
+def check_cancelled(cancel):
+    # cancel is a threading.Event (a WorkerJob's cancel_event) or None.
+    if cancel is not None and cancel.is_set():
+        raise FetchCancelled("Cancelled.")
+
+def http_error_count():
+    return getattr(_http_errors, "count", 0)
+
+def fetch_all(calls, deadline=None, progress=None, cancel=None):
+    # Run independent (func, *args) calls concurrently; anything still running at the
+    # deadline is reported as None and left to finish in the background. When cancel is
+    # set, calls that have not started are dropped and FetchCancelled is raised; requests
+    # already on the wire cannot be interrupted and finish in the background.
+    check_cancelled(cancel)
+    executor = get_fetch_executor()
+    futures = {name: executor.submit(func, *args) for name, (func, *args) in calls.items()}
+    if progress is not None:
+        for name, future in futures.items():
+            future.add_done_callback(lambda _, name=name: progress(f"Received {name} data"))
+    end = None if deadline is None else time.monotonic() + deadline
+    not_done = set(futures.values())
+    while not_done:
+        remaining = None if end is None else end - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            break
+        if cancel is not None:
+            remaining = CANCEL_POLL_SECONDS if remaining is None else min(remaining, CANCEL_POLL_SECONDS)
+        _, not_done = wait(not_done, timeout=remaining)
+        if cancel is not None and cancel.is_set():
+            for future in futures.values():
+                future.cancel()
+            raise FetchCancelled("Cancelled.")
+    done = set(futures.values()) - not_done
+    results = {}
+    for name, future in futures.items():
+        if future in done and future.exception() is None:
+            results[name] = future.result()
+        else:
+            if future in not_done:
+                future.cancel()
+                print(f"⚠️ Deadline exceeded waiting for {name}")
+            else:
+                print(f"❌ {name} failed: {future.exception()}")
+            results[name] = None
+    return results
+
+# ----------------------- Provider Circuit Breakers -----------------------
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=3, base_backoff=5.0, max_backoff=300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.open_until = 0.0
+        self.lock = threading.Lock()
+    def allow(self):
+        with self.lock:
+            return time.monotonic() >= self.open_until
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.open_until = 0.0
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                # Each further failure doubles how long the provider is skipped.
+                backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.failures - self.failure_threshold))
+                self.open_until = time.monotonic() + backoff
+                print(f"⚠️ {self.name} failed {self.failures} times; skipping it for {backoff:.0f}s")
+
+_circuit_breakers = {}
+
+def get_circuit_breaker(name):
+    with _fetch_lock:
+        if name not in _circuit_breakers:
+            _circuit_breakers[name] = CircuitBreaker(name)
+        return _circuit_breakers[name]
+
+def call_provider(name, func, *args):
+    # Returns None without calling func while the provider's breaker is open. Only exceptions
+    # and failed requests (errors, timeouts, bad JSON) count against the provider; a healthy
+    # provider that has no data for this point returns None without touching the breaker.
+    breaker = get_circuit_breaker(name)
+    if not breaker.allow():
+        trace_count("circuit_open", provider=name)
+        return None
+    errors_before = http_error_count()
+    try:
+        result = func(*args)
+        failed = http_error_count() > errors_before
+    except Exception as e:
+        print(f"❌ {name} error: {e}")
+        result, failed = None, True
+    if failed:
+        trace_count("provider_failures", provider=name)
+        breaker.record_failure()
+        return None
+    if result is None or result == "No data":
+        trace_count("provider_no_data", provider=name)
+        return None
+    breaker.record_success()
+    return result
+
+def race_providers(providers, args, deadline, cancel=None):
+    # Start every provider at once and take the first usable answer before the deadline.
+    candidates = [(name, func) for name, func in providers if get_circuit_breaker(name).allow()]
+    if not candidates:
+        return None
+    executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="race")
+    try:
+        pending = {executor.submit(call_provider, name, func, *args) for name, func in candidates}
+        while pending:
+            check_cancelled(cancel)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if cancel is not None:
+                remaining = min(remaining, CANCEL_POLL_SECONDS)
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.result() is not None:
+                    return future.result()
+        return None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# ----------------------- Response Cache -----------------------
+
+class ResponseCache:
+    def __init__(self, path=RESPONSE_CACHE_PATH, grid=CACHE_GRID_DEGREES, max_memory_entries=CACHE_MEMORY_ENTRIES):
+        self.grid = grid
+        self.max_memory_entries = max_memory_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "expired": 0}
+        self.db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("CREATE TABLE IF NOT EXISTS responses "
+                            "(key TEXT PRIMARY KEY, expires_at REAL, value TEXT NOT NULL)")
+            self.db.commit()
+    def make_key(self, endpoint, lat, lon, params=None):
+        cell_lat = round(round(float(lat) / self.grid) * self.grid, 6)
+        cell_lon = round(round(float(lon) / self.grid) * self.grid, 6)
+        # Coordinates and credentials are not part of the identity of a response.
+        extra = {k: v for k, v in (params or {}).items()
+                 if k not in ("lat", "lon", "latitude", "longitude", "locations", "appid")}
+        return json.dumps([endpoint, cell_lat, cell_lon, sorted(extra.items())], default=str)
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            if key in self.memory:
+                expires_at, value = self.memory[key]
+                if expires_at is None or expires_at > now:
+                    self.memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    trace_count("response_cache.memory_hit")
+                    return value
+                del self.memory[key]
+                self.stats["expired"] += 1
+                trace_count("response_cache.expired")
+            if self.db is not None:
+                row = self.db.execute("SELECT expires_at, value FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    expires_at, raw = row
+                    if expires_at is None or expires_at > now:
+                        value = json.loads(raw)
+                        self._remember(key, expires_at, value)
+                        self.stats["disk_hits"] += 1
+                        trace_count("response_cache.disk_hit")
+                        return value
+                    self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.db.commit()
+                    self.stats["expired"] += 1
+                    trace_count("response_cache.expired")
+            self.stats["misses"] += 1
+            trace_count("response_cache.miss")
+        return None
+    def set(self, key, value, ttl=None):
+        expires_at = None if ttl is None else time.time() + ttl
+        with self.lock:
+            self._remember(key, expires_at, value)
+            if self.db is not None:
+                self.db.execute("INSERT OR REPLACE INTO responses (key, expires_at, value) VALUES (?, ?, ?)",
+                                (key, expires_at, json.dumps(value)))
+                self.db.commit()
+            self.stats["stores"] += 1
+        trace_count("response_cache.store")
+    def _remember(self, key, expires_at, value):
+        self.memory[key] = (expires_at, value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+    def hit_rate(self):
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+    def report(self):
+        print(f"Response cache: {self.stats['memory_hits']} memory hits, {self.stats['disk_hits']} disk hits, "
+              f"{self.stats['misses']} misses, {self.stats['expired']} expired, {self.stats['stores']} stored "
+              f"({self.hit_rate():.0%} hit rate)")
+
+_response_cache = None
+
+def get_response_cache():
+    global _response_cache
+    with _fetch_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
+
+def set_response_cache(cache):
+    # Pass None to restore the default on next use, or ResponseCache(path=None) for memory-only.
+    global _response_cache
+    with _fetch_lock:
+        _response_cache = cache
+
+def climate_ttl(end_date_str):
+    # A date range that ended before today can no longer change.
+    if datetime.strptime(end_date_str, "%Y%m%d").date() < datetime.now().date():
+        return CACHE_TTLS["climate_closed"]
+    return CACHE_TTLS["climate_open"]
+
+# ----------------------- Spatial Reuse Index -----------------------
+
+SPATIAL_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".gardener_cache", "spatial.sqlite")
+# How far (km) a fetched result may be reused from. SoilGrids is a 250 m grid, SRTM 90 m and
+# NASA POWER half a degree, so climate carries much further than soil or terrain.
+SPATIAL_RADII_KM = {"climate": 10.0, "soil": 0.25, "elevation": 0.1}
+SPATIAL_NEIGHBOURS = 4
+SPATIAL_IDW_POWER = 2
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = radians(1) * EARTH_RADIUS_KM
+# Climate response keys and soil properties as LocationReport.sources names them.
+CLIMATE_SOURCE_FIELDS = {"Date Range": "climate_date_range", "Average Temperature (T2M)": "avg_temperature",
+                         "Total Precipitation (PRECTOT)": "total_precipitation"}
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+def inverse_distance_weighted(neighbours, power=SPATIAL_IDW_POWER):
+    # neighbours is [(distance_km, value)]; a point on top of a neighbour takes its value outright.
+    for distance, value in neighbours:
+        if distance < 1e-6:
+            return value
+    weights = [distance ** -power for distance, _ in neighbours]
+    return sum(w * value for w, (_, value) in zip(weights, neighbours)) / sum(weights)
+
+def blend_neighbours(found, interpolate=True, power=SPATIAL_IDW_POWER):
+    # (value, km to the nearest point it came from) for [(distance_km, value)] nearest first.
+    # Dicts blend field by field, skipping neighbours where a field is missing; numbers are
+    # inverse-distance weighted; anything else is taken from the nearest neighbour.
+    nearest_distance, nearest = found[0]
+    if isinstance(nearest, dict):
+        value, distances = {}, {}
+        for name in nearest:
+            present = [(d, v[name]) for d, v in found if isinstance(v, dict) and v.get(name) not in (None, "No data")]
+            value[name], distances[name] = blend_neighbours(present, interpolate, power) if present else (None, None)
+        return value, distances
+    if not interpolate or isinstance(nearest, str) or to_float(nearest) is None:
+        return nearest, nearest_distance
+    numeric = [(d, to_float(v)) for d, v in found if not isinstance(v, str) and to_float(v) is not None]
+    return inverse_distance_weighted(numeric, power), nearest_distance
+
+class SpatialIndex:
+    # Previously fetched soil, elevation and climate results, bucketed on a lat/lon grid per
+    # kind with cells one reuse radius tall, so a lookup only scans the cells around a point.
+    # Climate is also keyed by month, since only the same month of the same year can be reused.
+    def __init__(self, path=SPATIAL_INDEX_PATH, radii=None, neighbours=SPATIAL_NEIGHBOURS, interpolate=True,
+                 power=SPATIAL_IDW_POWER):
+        self.radii = {kind: radius for kind, radius in (SPATIAL_RADII_KM if radii is None else radii).items()
+                      if radius > 0}
+        self.neighbours = neighbours
+        self.interpolate = interpolate
+        self.power = power
+        self.cells = {kind: {} for kind in self.radii}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+        self.db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("CREATE TABLE IF NOT EXISTS observations (kind TEXT, key TEXT, lat REAL, lon REAL, "
+                            "expires_at REAL, value TEXT NOT NULL, PRIMARY KEY (kind, key, lat, lon))")
+            self.db.commit()
+            rows = self.db.execute("SELECT kind, key, lat, lon, expires_at, value FROM observations "
+                                   "WHERE expires_at IS NULL OR expires_at > ?", (time.time(),)).fetchall()
+            for kind, key, lat, lon, expires_at, value in rows:
+                self._insert(kind, key, lat, lon, expires_at, json.loads(value))
+    def _cell(self, kind, lat, lon):
+        size = self.radii[kind] / KM_PER_DEGREE
+        return int(lat // size), int(lon // size)
+    def _insert(self, kind, key, lat, lon, expires_at, value):
+        if kind not in self.radii:
+            return False
+        bucket = self.cells[kind].setdefault(self._cell(kind, lat, lon), [])
+        bucket[:] = [entry for entry in bucket if entry[:3] != (lat, lon, key)]
+        bucket.append((lat, lon, key, expires_at, value))
+        return True
+    def add(self, kind, lat, lon, value, key="", ttl=None):
+        if value is None:
+            return
+        lat, lon = float(lat), float(lon)
+        expires_at = None if ttl is None else time.time() + ttl
+        with self.lock:
+            if not self._insert(kind, key, lat, lon, expires_at, value):
+                return
+            if self.db is not None:
+                self.db.execute("INSERT OR REPLACE INTO observations (kind, key, lat, lon, expires_at, value) "
+                                "VALUES (?, ?, ?, ?, ?, ?)", (kind, key, lat, lon, expires_at, json.dumps(value)))
+                self.db.commit()
+            self.stats["stores"] += 1
+    def nearest(self, kind, lat, lon, key=""):
+        # [(distance_km, value)] for up to `neighbours` live points within the radius, nearest first.
+        if kind not in self.radii:
+            return []
+        radius = self.radii[kind]
+        row, col = self._cell(kind, lat, lon)
+        # A cell is one radius tall but narrower than that on the ground away from the equator.
+        col_span = min(ceil(1 / max(cos(radians(lat)), 1e-6)), ceil(360 * KM_PER_DEGREE / radius))
+        now = time.time()
+        found = []
+        with self.lock:
+            cells = self.cells[kind]
+            for r in (row - 1, row, row + 1):
+                for c in range(col - col_span, col + col_span + 1):
+                    for p_lat, p_lon, p_key, expires_at, value in cells.get((r, c), ()):
+                        if p_key != key or (expires_at is not None and expires_at <= now):
+                            continue
+                        distance = haversine_km(lat, lon, p_lat, p_lon)
+                        if distance <= radius:
+                            found.append((distance, value))
+        found.sort(key=lambda item: item[0])
+        return found[:self.neighbours]
+    def estimate(self, kind, lat, lon, key=""):
+        # (value, source distance) answered from nearby points, or (None, None) when none are in range.
+        found = self.nearest(kind, lat, lon, key)
+        with self.lock:
+            self.stats["hits" if found else "misses"] += 1
+        trace_count(f"spatial_index.{'hit' if found else 'miss'}", kind=kind)
+        if not found:
+            return None, None
+        return blend_neighbours(found, self.interpolate, self.power)
+    def uncovered(self, kind, points):
+        # The points still worth fetching: greedily keeps a point only when neither the index
+        # nor an already kept point is within the radius, so a dense field needs few fetches.
+        if kind not in self.radii:
+            return list(points)
+        kept = SpatialIndex(path=None, radii={kind: self.radii[kind]}, neighbours=1)
+        seeds = []
+        for lat, lon in points:
+            if self.nearest(kind, lat, lon) or kept.nearest(kind, lat, lon):
+                continue
+            kept.add(kind, lat, lon, True)
+            seeds.append((lat, lon))
+        return seeds
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+    def report(self):
+        print(f"Spatial index: {self.stats['hits']} reused, {self.stats['misses']} fetched, "
+              f"{self.stats['stores']} stored ({self.hit_rate():.0%} reuse rate)")
+
+_spatial_index = None
+
+def get_spatial_index():
+    global _spatial_index
+    with _fetch_lock:
+        if _spatial_index is None:
+            _spatial_index = SpatialIndex()
+        return _spatial_index
+
+def set_spatial_index(index):
+    # Pass None to restore the default on next use, or SpatialIndex(path=None, radii={}) to disable reuse.
+    global _spatial_index
+    with _fetch_lock:
+        _spatial_index = index
+
 # ----------------------- API and Data Functions -----------------------
 
-def fetch_api(url, params=None):
+def fetch_api(url, params=None, timeout=HTTP_TIMEOUT):
     try:
-        response = requests.get(url, params=params, timeout=10)
+        with host_semaphore(url), trace_stage(f"http {urlsplit(url).netloc}"):
+            response = get_http_session().get(url, params=params, timeout=timeout)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         print(f"❌ Request error: {url} - {e}")
     except requests.exceptions.JSONDecodeError:
         print(f"⚠️ JSON parsing failed: {url}")
+    trace_count("http_errors", url=url)
+    _http_errors.count = http_error_count() + 1
     return None
 
+def fetch_api_cached(url, params, lat, lon, ttl):
+    cache = get_response_cache()
+    key = cache.make_key(url, lat, lon, params)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    response = fetch_api(url, params)
+    if response is not None:
+        cache.set(key, response, ttl)
+    return response
+
 def get_alternative_precipitation(lat, lon, start_date, end_date):
     start_date_alt = f"{start_date[:4]}-{start_date[4:6]}-{start_date[6:]}"
     end_date_alt = f"{end_date[:4]}-{end_date[4:6]}-{end_date[6:]}"
-    url = "https://archive-api.open-meteo.com/v1/archive"
+    url = OPEN_METEO_ARCHIVE_URL
     params = {
         "latitude": lat,
         "longitude": lon,
@@ -41,7 +672,7 @@ def get_alternative_precipitation(lat, lon, start_date, end_date):
         "daily": "precipitation_sum",
         "timezone": "auto"
     }
-    response = fetch_api(url, params)
+    response = fetch_api_cached(url, params, lat, lon, climate_ttl(end_date))
     if response and "daily" in response and "precipitation_sum" in response["daily"]:
         precip_values = response["daily"]["precipitation_sum"]
         if precip_values:
@@ -61,104 +692,321 @@ def get_meteostat_precipitation(lat, lon, month, year):
         return "No data"
     return data['prcp'].sum()
 
-def get_climate_data(lat, lon, month, year, max_years_back=5):
+def open_meteo_precipitation(lat, lon, month, year, start_date_str, end_date_str):
+    return get_alternative_precipitation(lat, lon, start_date_str, end_date_str)
+
+def meteostat_precipitation(lat, lon, month, year, start_date_str, end_date_str):
+    return get_meteostat_precipitation(lat, lon, month, year)
+
+# Raced when NASA POWER has no precipitation for a month; append (name, func) to add providers.
+PRECIPITATION_PROVIDERS = [
+    ("open_meteo", open_meteo_precipitation),
+    ("meteostat", meteostat_precipitation)
+]
+
+def get_nasa_power_daily(lat, lon, start_date_str, end_date_str, parameters="T2M,PRECTOT"):
+    params = {
+        "parameters": parameters,
+        "community": "RE",
+        "longitude": lon,
+        "latitude": lat,
+        "start": start_date_str,
+        "end": end_date_str,
+        "format": "JSON"
+    }
+    climate_response = fetch_api_cached(NASA_POWER_URL, params, lat, lon, climate_ttl(end_date_str))
+    if (climate_response and "properties" in climate_response and
+        "parameter" in climate_response["properties"]):
+        return climate_response["properties"]["parameter"]
+    return None
+
+def get_open_meteo_daily_precipitation(lat, lon, start_date_str, end_date_str):
+    # {YYYYMMDD: mm} for a whole range in one Open-Meteo request.
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "start_date": datetime.strptime(start_date_str, "%Y%m%d").strftime("%Y-%m-%d"),
+        "end_date": datetime.strptime(end_date_str, "%Y%m%d").strftime("%Y-%m-%d"),
+        "daily": "precipitation_sum",
+        "timezone": "auto"
+    }
+    response = fetch_api_cached(OPEN_METEO_ARCHIVE_URL, params, lat, lon, climate_ttl(end_date_str))
+    daily = (response or {}).get("daily") or {}
+    values = daily.get("precipitation_sum")
+    if not values:
+        return None
+    first = datetime.strptime(start_date_str, "%Y%m%d").toordinal()
+    days = daily.get("time") or [datetime.fromordinal(first + i).strftime("%Y-%m-%d") for i in range(len(values))]
+    return {day.replace("-", ""): value for day, value in zip(days, values)}
+
+def get_climate_data(lat, lon, month, year, max_years_back=5, budget=CLIMATE_LATENCY_BUDGET, cancel=None):
     now = datetime.now()
     current_year = now.year
     current_month = now.month
     if year > current_year or (year == current_year and month > current_month):
         return {"Error": "Input month/year is in the future. Please provide a month up to the current month."}
+    deadline = time.monotonic() + budget
     first_day = 1
     last_day = now.day if (year == current_year and month == current_month) else calendar.monthrange(year, month)[1]
-    attempts = 0
-    adjusted_year = year
-    while attempts < max_years_back:
+    candidate_years = [year - offset for offset in range(max_years_back)]
+    # One NASA POWER request spanning every candidate year replaces one request per year.
+    range_start = datetime(candidate_years[-1], month, first_day).strftime("%Y%m%d")
+    range_end = datetime(year, month, last_day).strftime("%Y%m%d")
+    check_cancelled(cancel)
+    print(f"Fetching NASA POWER data for {range_start} to {range_end}...")
+    parameters = call_provider("nasa_power", get_nasa_power_daily, lat, lon, range_start, range_end) or {}
+    t2m_data = parameters.get("T2M", {})
+    prectot_data = parameters.get("PRECTOT", {})
+    for adjusted_year in candidate_years:
+        check_cancelled(cancel)
+        if time.monotonic() >= deadline:
+            print(f"⚠️ Climate lookup exceeded its {budget}s budget")
+            break
         start_date_str = datetime(adjusted_year, month, first_day).strftime("%Y%m%d")
         end_date_str = datetime(adjusted_year, month, last_day).strftime("%Y%m%d")
-        print(f"Fetching NASA POWER data for {start_date_str} to {end_date_str}...")
-        params = {
-            "parameters": "T2M,PRECTOT",
-            "community": "RE",
-            "longitude": lon,
-            "latitude": lat,
-            "start": start_date_str,
-            "end": end_date_str,
-            "format": "JSON"
-        }
-        climate_response = fetch_api("https://power.larc.nasa.gov/api/temporal/daily/point", params)
-        if (climate_response and "properties" in climate_response and
-            "parameter" in climate_response["properties"]):
-            parameters = climate_response["properties"]["parameter"]
-            t2m_data = parameters.get("T2M", {})
-            prectot_data = parameters.get("PRECTOT", {})
-            valid_t2m = [v for v in t2m_data.values() if v != -999.0]
-            valid_prectot = [v for v in prectot_data.values() if v != -999.0]
-            avg_t2m = sum(valid_t2m) / len(valid_t2m) if valid_t2m else "No data"
-            if valid_prectot:
-                total_prectot = sum(valid_prectot)
-            else:
-                print("NASA precipitation missing; trying Open-Meteo...")
-                total_prectot = get_alternative_precipitation(lat, lon, start_date_str, end_date_str)
-                if total_prectot == "No data":
-                    print("Open-Meteo data missing; trying Meteostat as third alternative...")
-                    total_prectot = get_meteostat_precipitation(lat, lon, month, adjusted_year)
-            if avg_t2m != "No data" or total_prectot != "No data":
-                return {
-                    "Date Range": f"{start_date_str} to {end_date_str}",
-                    "Average Temperature (T2M)": avg_t2m,
-                    "Total Precipitation (PRECTOT)": total_prectot
-                }
-        adjusted_year -= 1
-        attempts += 1
+        valid_t2m = [v for day, v in t2m_data.items() if start_date_str <= day <= end_date_str and v != -999.0]
+        valid_prectot = [v for day, v in prectot_data.items()
+                         if start_date_str <= day <= end_date_str and v != -999.0]
+        avg_t2m = sum(valid_t2m) / len(valid_t2m) if valid_t2m else "No data"
+        if valid_prectot:
+            total_prectot = sum(valid_prectot)
+        else:
+            print("NASA precipitation missing; racing Open-Meteo and Meteostat...")
+            trace_count("fallback.precipitation")
+            total_prectot = race_providers(PRECIPITATION_PROVIDERS,
+                                           (lat, lon, month, adjusted_year, start_date_str, end_date_str),
+                                           deadline, cancel)
+            if total_prectot is None:
+                total_prectot = "No data"
+        if avg_t2m != "No data" or total_prectot != "No data":
+            return {
+                "Date Range": f"{start_date_str} to {end_date_str}",
+                "Average Temperature (T2M)": avg_t2m,
+                "Total Precipitation (PRECTOT)": total_prectot
+            }
     return {"Error": f"No climate data for month {month} in past {max_years_back} years from {year}."}
 
 def get_weather_data(lat, lon):
-    url = "https://api.openweathermap.org/data/2.5/weather"
+    url = OPENWEATHER_URL
     params = {"lat": lat, "lon": lon, "appid": OPENWEATHER_API_KEY, "units": "metric"}
-    return fetch_api(url, params)
-
-def get_soil_data(lat, lon, depth="0-5cm"):
-    url = "https://rest.isric.org/soilgrids/v2.0/properties/query"
-    properties = ["phh2o", "soc", "clay", "silt", "sand", "cec", "cfvo"]
-    soil_data = {}
-    for prop in properties:
-        params = {"lat": lat, "lon": lon, "property": prop, "depth": depth, "value": "mean"}
-        response = fetch_api(url, params)
-        if response and "features" in response and len(response["features"]) > 0:
-            soil_data[prop] = response["features"][0]["properties"].get(prop, {}).get(depth, {}).get("mean", None)
-        else:
-            soil_data[prop] = None
-    return soil_data
+    return fetch_api_cached(url, params, lat, lon, CACHE_TTLS["weather"])
+
+def get_soil_property(lat, lon, prop, depth="0-5cm"):
+    params = {"lat": lat, "lon": lon, "property": prop, "depth": depth, "value": "mean"}
+    response = fetch_api_cached(SOILGRIDS_URL, params, lat, lon, CACHE_TTLS["soil"])
+    if response and "features" in response and len(response["features"]) > 0:
+        return response["features"][0]["properties"].get(prop, {}).get(depth, {}).get("mean", None)
+    return None
+
+def get_soil_data(lat, lon, depth="0-5cm", deadline=None, cancel=None):
+    results = fetch_all({prop: (get_soil_property, lat, lon, prop, depth) for prop in SOIL_PROPERTIES},
+                        deadline, cancel=cancel)
+    return {prop: results[prop] for prop in SOIL_PROPERTIES}
 
 def get_terrain_data(lat, lon):
-    url = "https://api.opentopodata.org/v1/srtm90m"
+    url = OPENTOPODATA_URL
     params = {"locations": f"{lat},{lon}"}
-    return fetch_api(url, params)
+    return fetch_api_cached(url, params, lat, lon, CACHE_TTLS["terrain"])
 
-def get_location_info(lat, lon, month, year):
-    report = {}
-    report["Climate Data"] = get_climate_data(lat, lon, month, year)
-    weather_response = get_weather_data(lat, lon)
+def parse_soil_layers(response, properties, depths):
+    # SoilGrids returns {"properties": {"layers": [{"name", "depths": [{"label", "values"}]}]}};
+    # the older per-feature layout read by get_soil_property is accepted as well.
+    soil_data = {depth: dict.fromkeys(properties) for depth in depths}
+    if not response:
+        return soil_data
+    layers = response.get("properties", {}).get("layers") if isinstance(response.get("properties"), dict) else None
+    if layers:
+        for layer in layers:
+            if layer.get("name") not in properties:
+                continue
+            for layer_depth in layer.get("depths", []):
+                if layer_depth.get("label") in soil_data:
+                    soil_data[layer_depth["label"]][layer["name"]] = layer_depth.get("values", {}).get("mean")
+    elif response.get("features"):
+        feature_properties = response["features"][0].get("properties", {})
+        for depth in depths:
+            for prop in properties:
+                soil_data[depth][prop] = feature_properties.get(prop, {}).get(depth, {}).get("mean", None)
+    return soil_data
+
+def get_soil_data_bulk(lat, lon, properties=SOIL_PROPERTIES, depths=("0-5cm",)):
+    # One request for every property and depth; requests encodes the lists as repeated keys.
+    params = {"lat": lat, "lon": lon, "property": list(properties), "depth": list(depths), "value": "mean"}
+    response = fetch_api_cached(SOILGRIDS_URL, params, lat, lon, CACHE_TTLS["soil"])
+    if response is None:
+        return None
+    return parse_soil_layers(response, properties, depths)
+
+def get_terrain_data_bulk(points, batch_size=OPENTOPODATA_BATCH_SIZE):
+    # Packs up to batch_size coordinates per opentopodata call and splits the results back
+    # per point. Each point is stored under the same cache key get_terrain_data uses.
+    cache = get_response_cache()
+    elevations = [None] * len(points)
+    pending = []
+    for i, (lat, lon) in enumerate(points):
+        cached = cache.get(cache.make_key(OPENTOPODATA_URL, lat, lon))
+        if cached is not None:
+            elevations[i] = cached["results"][0].get("elevation") if cached.get("results") else None
+        else:
+            pending.append(i)
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        params = {"locations": "|".join(f"{points[i][0]},{points[i][1]}" for i in chunk)}
+        response = fetch_api(OPENTOPODATA_URL, params)
+        results = response.get("results", []) if response else []
+        if len(results) != len(chunk):
+            print(f"⚠️ Elevation batch returned {len(results)} results for {len(chunk)} points")
+            continue
+        for i, result in zip(chunk, results):
+            elevations[i] = result.get("elevation")
+            cache.set(cache.make_key(OPENTOPODATA_URL, *points[i]), {"results": [result]}, CACHE_TTLS["terrain"])
+    return elevations
+
+def to_float(value):
+    # API fields come back as numbers, numeric strings or "No data"; anything non-numeric is missing.
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+@dataclass(slots=True)
+class LocationReport:
+    lat: float
+    lon: float
+    month: int
+    year: int
+    # None is the missing marker for every numeric field.
+    location_name: str = None
+    temperature: float = None
+    humidity: float = None
+    pressure: float = None
+    climate_date_range: str = None
+    avg_temperature: float = None
+    total_precipitation: float = None
+    soil: dict = field(default_factory=dict)
+    elevation: float = None
+    errors: dict = field(default_factory=dict)
+    # Field -> km to the nearest point it was reused from; fields fetched for this point are absent.
+    sources: dict = field(default_factory=dict)
+    def to_sensor_data(self):
+        return {
+            'T': self.temperature,
+            'H': self.humidity,
+            'P': self.pressure,
+            'T_avg': self.avg_temperature,
+            'AP': self.total_precipitation,
+            'pH': self.soil.get("phh2o")
+        }
+    def missing_sensor_keys(self):
+        return [key for key, value in self.to_sensor_data().items() if value is None]
+    def to_dict(self):
+        # Same section/key layout get_location_info has always returned.
+        report = {}
+        if "Climate Data" in self.errors:
+            report["Climate Data"] = {"Error": self.errors["Climate Data"]}
+        else:
+            report["Climate Data"] = {
+                "Date Range": self.climate_date_range,
+                "Average Temperature (T2M)": self.avg_temperature,
+                "Total Precipitation (PRECTOT)": self.total_precipitation
+            }
+        report["Weather Data"] = self.errors.get("Weather Data") or {
+            "Location": self.location_name,
+            "Temperature": self.temperature,
+            "Humidity": self.humidity,
+            "Pressure": self.pressure
+        }
+        report["Soil Data (Depth 0-5cm)"] = self.errors.get("Soil Data (Depth 0-5cm)") or dict(self.soil)
+        report["Elevation Data"] = self.errors.get("Elevation Data") or {"Elevation (meters)": self.elevation}
+        if self.sources:
+            report["Nearby Sources (km)"] = dict(self.sources)
+        return report
+
+def build_location_report(lat, lon, month, year, climate, weather_response, soil, terrain_response):
+    report = LocationReport(lat=lat, lon=lon, month=month, year=year)
+    if not climate or "Error" in climate:
+        report.errors["Climate Data"] = (climate or {}).get("Error", "Climate data request did not complete.")
+    else:
+        report.climate_date_range = climate.get("Date Range")
+        report.avg_temperature = to_float(climate.get("Average Temperature (T2M)"))
+        report.total_precipitation = to_float(climate.get("Total Precipitation (PRECTOT)"))
     if weather_response and "main" in weather_response:
         main = weather_response["main"]
-        report["Weather Data"] = {
-            "Location": weather_response.get("name", "Unknown"),
-            "Temperature": main.get("temp", "No data"),
-            "Humidity": main.get("humidity", "No data"),
-            "Pressure": main.get("pressure", "No data")
-        }
+        report.location_name = weather_response.get("name", "Unknown")
+        report.temperature = to_float(main.get("temp"))
+        report.humidity = to_float(main.get("humidity"))
+        report.pressure = to_float(main.get("pressure"))
     else:
-        report["Weather Data"] = "No weather data retrieved."
-    soil_response = get_soil_data(lat, lon)
-    report["Soil Data (Depth 0-5cm)"] = soil_response if soil_response else "No soil data retrieved."
-    terrain_response = get_terrain_data(lat, lon)
+        report.errors["Weather Data"] = "No weather data retrieved."
+    if soil:
+        report.soil = {prop: to_float(value) for prop, value in soil.items()}
+    else:
+        report.errors["Soil Data (Depth 0-5cm)"] = "No soil data retrieved."
     if terrain_response and "results" in terrain_response and len(terrain_response["results"]) > 0:
-        elevation = terrain_response["results"][0].get("elevation", "No data")
-        report["Elevation Data"] = {"Elevation (meters)": elevation}
+        report.elevation = to_float(terrain_response["results"][0].get("elevation"))
     else:
-        report["Elevation Data"] = "No elevation data retrieved."
+        report.errors["Elevation Data"] = "No elevation data retrieved."
     return report
 
-def export_report_to_csv(report, filepath='/Users/michael_z/Downloads/location_data_report.csv'):
+def get_location_report(lat, lon, month, year, deadline=LOCATION_REPORT_DEADLINE, progress=None, cancel=None):
+    # Climate, soil and elevation come from nearby points already fetched when the spatial
+    # index has any in range; everything else goes out at once and the report waits only
+    # for the slowest lookup.
+    index = get_spatial_index()
+    climate_key = f"{year}-{month:02d}"
+    reused = {}
+    for kind, key in (("climate", climate_key), ("soil", ""), ("elevation", "")):
+        value, distance = index.estimate(kind, lat, lon, key)
+        if value is not None:
+            reused[kind] = (value, distance)
+    calls = {"weather": (get_weather_data, lat, lon)}
+    if "climate" not in reused:
+        calls["climate"] = (get_climate_data, lat, lon, month, year, 5, CLIMATE_LATENCY_BUDGET, cancel)
+    if "elevation" not in reused:
+        calls["terrain"] = (get_terrain_data, lat, lon)
+    if "soil" not in reused:
+        calls["soil"] = (get_soil_data_bulk, lat, lon)
+    start = time.monotonic()
+    with trace_stage("location_fetch"):
+        results = fetch_all(calls, deadline, progress, cancel)
+    if "soil" in reused:
+        soil_response = reused["soil"][0]
+    else:
+        soil_response = results["soil"]["0-5cm"] if results["soil"] else None
+        if soil_response is None:
+            # The combined SoilGrids request failed; fall back to one request per property.
+            trace_count("fallback.soil")
+            remaining = None if deadline is None else max(0.0, deadline - (time.monotonic() - start))
+            soil_response = get_soil_data(lat, lon, deadline=remaining, cancel=cancel)
+    climate = reused["climate"][0] if "climate" in reused else results["climate"]
+    terrain_response = ({"results": [{"elevation": reused["elevation"][0]}]} if "elevation" in reused
+                        else results["terrain"])
+    report = build_location_report(lat, lon, month, year, climate, results["weather"], soil_response,
+                                   terrain_response)
+    if "climate" in reused:
+        report.sources.update({CLIMATE_SOURCE_FIELDS[name]: distance
+                               for name, distance in reused["climate"][1].items() if distance is not None})
+    elif climate and "Error" not in climate:
+        index.add("climate", lat, lon, climate, climate_key, climate_ttl(climate["Date Range"].split()[-1]))
+    if "soil" in reused:
+        report.sources.update({f"soil.{prop}": distance
+                               for prop, distance in reused["soil"][1].items() if distance is not None})
+    elif any(value is not None for value in report.soil.values()):
+        index.add("soil", lat, lon, report.soil, ttl=CACHE_TTLS["soil"])
+    if "elevation" in reused:
+        report.sources["elevation"] = reused["elevation"][1]
+    elif report.elevation is not None:
+        index.add("elevation", lat, lon, report.elevation, ttl=CACHE_TTLS["terrain"])
+    return report
+
+def get_location_info(lat, lon, month, year, deadline=LOCATION_REPORT_DEADLINE, progress=None):
+    return get_location_report(lat, lon, month, year, deadline, progress).to_dict()
+
+def export_report_to_csv(report, filepath=REPORT_EXPORT_PATH):
+    if isinstance(report, LocationReport):
+        report = report.to_dict()
     try:
         with open(filepath, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
@@ -173,7 +1021,21 @@ def export_report_to_csv(report, filepath='/Users/michael_z/Downloads/location_d
     except Exception as e:
         print(f"Error exporting report: {e}")
 
-def read_report_from_csv(filepath='/Users/michael_z/Downloads/location_data_report.csv'):
+def export_report_to_json(report, filepath):
+    if isinstance(report, LocationReport):
+        report = report.to_dict()
+    try:
+        write_json_file(filepath, report)
+        print(f"Successfully exported report to {filepath}")
+    except Exception as e:
+        print(f"Error exporting report: {e}")
+
+def export_report_async(report, filepath=REPORT_EXPORT_PATH):
+    # Export is an optional side output; scoring never waits on it.
+    exporter = export_report_to_json if filepath.endswith('.json') else export_report_to_csv
+    return get_fetch_executor().submit(exporter, report, filepath)
+
+def read_report_from_csv(filepath=REPORT_EXPORT_PATH):
     report = {}
     try:
         with open(filepath, 'r') as csvfile:
@@ -191,24 +1053,97 @@ def read_report_from_csv(filepath='/Users/michael_z/Downloads/location_data_repo
         print(f"Error reading CSV: {e}")
     return report
 
-def load_local_crop_datasets(folder_path):
-    csv_files = glob.glob(os.path.join(folder_path, '*.csv'))
+GROUP_COLUMNS = ['label', 'crop', 'common_name', 'plant_name']
+# Pressure is optional; when a database has it, it provides a per-crop P_opt.
+VALUE_COLUMNS = ['Temperature', 'Humidity', 'pH', 'Rainfall', 'Pressure']
+# Per-crop mean and spread keys produced from each value column.
+OPTIMUM_KEYS = {'Temperature': 'T_opt', 'Humidity': 'H_opt', 'pH': 'pH_opt', 'Rainfall': 'AP_opt',
+                'Pressure': 'P_opt'}
+LEARNED_SIGMA_KEYS = {'Temperature': 'sigma_T', 'Humidity': 'sigma_H', 'pH': 'sigma_pH', 'Rainfall': 'sigma_AP',
+                      'Pressure': 'sigma_P'}
+# Rows per chunk when aggregating without loading whole files.
+STREAM_CHUNK_ROWS = 1 << 19
+CROP_COLUMN_DTYPES = {**{col: 'category' for col in GROUP_COLUMNS},
+                      **{col: 'float32' for col in VALUE_COLUMNS}}
+
+def read_crop_csv(path):
+    # One pass per file, keeping only the columns the pipeline uses.
+    usecols = lambda col: col in CROP_COLUMN_DTYPES
+    with trace_stage("csv_load", file=os.path.basename(path)):
+        try:
+            df = pd.read_csv(path, usecols=usecols, dtype=CROP_COLUMN_DTYPES)
+        except pd.errors.EmptyDataError:
+            df = pd.DataFrame()
+        except ValueError:
+            # A value column with stray text: fall back to coercing it instead of dropping the file.
+            df = pd.read_csv(path, usecols=usecols, dtype={col: 'category' for col in GROUP_COLUMNS})
+            for col in VALUE_COLUMNS:
+                if col in df.columns:
+                    df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    return df, {"path": path, "rows": len(df), "bytes": os.path.getsize(path),
+                "memory_bytes": int(df.memory_usage(deep=True).sum())}
+
+def read_crop_chunks(path, chunk_rows):
+    # Streaming counterpart of read_crop_csv: yields frames of at most chunk_rows rows. Value
+    # columns are always coerced per chunk, since stray text may only appear deep in a file.
+    usecols = lambda col: col in CROP_COLUMN_DTYPES
+    try:
+        reader = pd.read_csv(path, usecols=usecols, dtype={col: 'category' for col in GROUP_COLUMNS},
+                             chunksize=chunk_rows)
+    except pd.errors.EmptyDataError:
+        return
+    with reader:
+        for chunk in reader:
+            for col in VALUE_COLUMNS:
+                if col in chunk.columns:
+                    chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype('float32')
+            yield chunk
+
+def concat_crop_frames(dfs):
+    # Align category sets first so the group columns stay categorical through concat.
+    for col in GROUP_COLUMNS:
+        frames = [df for df in dfs if col in df.columns]
+        if len(frames) > 1:
+            categories = pd.api.types.union_categoricals([df[col] for df in frames]).categories
+            for df in frames:
+                df[col] = df[col].cat.set_categories(categories)
+    df_combined = pd.concat(dfs, ignore_index=True)
+    for col in GROUP_COLUMNS:
+        if col in df_combined.columns and not isinstance(df_combined[col].dtype, pd.CategoricalDtype):
+            df_combined[col] = df_combined[col].astype('category')
+    return df_combined
+
+def load_local_crop_datasets(folder_path, max_workers=None, report=None):
+    csv_files = sorted(glob.glob(os.path.join(folder_path, '*.csv')))
     if not csv_files:
         print(f"No CSV files found in {folder_path}")
         return None
-    dfs = [pd.read_csv(file) for file in csv_files if not pd.read_csv(file).empty]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(read_crop_csv, csv_files))
+    if report is not None:
+        report.extend(file_report for _, file_report in results)
+    dfs = [df for df, _ in results if not df.empty]
     if not dfs:
         return None
-    df_combined = pd.concat(dfs, ignore_index=True)
-    print(f"Combined DataFrame shape: {df_combined.shape}")
+    df_combined = concat_crop_frames(dfs)
+    total_bytes = sum(file_report["bytes"] for _, file_report in results)
+    print(f"Combined DataFrame shape: {df_combined.shape} "
+          f"({len(csv_files)} files, {total_bytes / 1e6:.1f} MB read, "
+          f"{df_combined.memory_usage(deep=True).sum() / 1e6:.1f} MB in memory)")
     return df_combined
 
-def export_plant_counts(df, folder_path):
-    total_plants = len(df)
+def count_plants(df):
     group_col = next((col for col in ['label', 'crop', 'common_name', 'plant_name'] if col in df.columns), None)
     if not group_col:
         raise KeyError(f"No suitable column found in {list(df.columns)}")
-    counts = df[group_col].value_counts().to_dict()
+    counts = df[group_col].value_counts()
+    return len(df), counts[counts > 0].to_dict()
+
+def export_plant_counts(df, folder_path):
+    total_plants, counts = count_plants(df)
+    write_plant_counts(total_plants, counts, folder_path)
+
+def write_plant_counts(total_plants, counts, folder_path):
     output_file = os.path.join(folder_path, "plant_count.txt")
     with open(output_file, "w") as f:
         f.write(f"Total number of plant rows: {total_plants}\n")
@@ -217,22 +1152,418 @@ def export_plant_counts(df, folder_path):
             f.write(f"{crop}: {count}\n")
     print(f"Plant counts exported to {output_file}")
 
-def compute_optimal_conditions(df):
+def compute_optimal_conditions(df, learn_sigmas=False):
     group_col = next((col for col in ['label', 'crop', 'common_name', 'plant_name'] if col in df.columns), None)
     if not group_col:
         raise KeyError(f"No suitable column found in {list(df.columns)}")
-    groups = df.groupby(group_col)
-    optimal = {
-        crop: {
-            'T_opt': group['Temperature'].mean(),
-            'H_opt': group['Humidity'].mean(),
-            'pH_opt': group['pH'].mean(),
-            'AP_opt': group['Rainfall'].mean()
+    # One groupby pass for every column; spreads come out of the same aggregation.
+    columns = [col for col in VALUE_COLUMNS if col in df.columns]
+    missing = [col for col in ['Temperature', 'Humidity', 'pH', 'Rainfall'] if col not in columns]
+    if missing:
+        raise KeyError(f"Missing columns {missing} in {list(df.columns)}")
+    with trace_stage("groupby", rows=len(df)):
+        aggregated = df.groupby(group_col, observed=True)[columns].agg(['mean', 'std'] if learn_sigmas else ['mean'])
+    optimal = {}
+    for crop, row in aggregated.iterrows():
+        optimal[crop] = {OPTIMUM_KEYS[col]: float(row[(col, 'mean')]) for col in columns}
+        if learn_sigmas:
+            optimal[crop].update({LEARNED_SIGMA_KEYS[col]: float(row[(col, 'std')]) for col in columns})
+    return optimal
+
+# ----------------------- Incremental Crop Statistics -----------------------
+
+def crop_statistics(df):
+    # Per-crop row counts plus count/mean/M2 (Welford) per value column, for every candidate
+    # group column present, so partial results from different files can be merged later.
+    stats = {"rows": len(df), "groups": {}}
+    if df.empty:
+        return stats
+    values = df.reindex(columns=VALUE_COLUMNS).astype('float64')
+    for group_col in GROUP_COLUMNS:
+        if group_col not in df.columns:
+            continue
+        groups = values.groupby(df[group_col], observed=True)
+        count = groups.count()
+        stats["groups"][group_col] = {
+            "crops": [str(crop) for crop in count.index],
+            "rows": groups.size().reindex(count.index).tolist(),
+            "count": count.to_numpy().tolist(),
+            "mean": groups.mean().fillna(0.0).to_numpy().tolist(),
+            "m2": (groups.var(ddof=0) * count).fillna(0.0).to_numpy().tolist()
+        }
+    return stats
+
+def file_crop_statistics(path, chunk_rows=STREAM_CHUNK_ROWS):
+    # Read in fixed-size chunks, so memory is bounded by the chunk size rather than the file.
+    with trace_stage("csv_load", file=os.path.basename(path)):
+        return fold_crop_statistics(crop_statistics(chunk) for chunk in read_crop_chunks(path, chunk_rows))
+
+def fold_crop_statistics(chunk_statistics):
+    # Folds a stream of crop_statistics() results into one result of the same shape, holding
+    # only per-crop accumulators between chunks.
+    folded = {"rows": 0, "groups": {}}
+    for stats in chunk_statistics:
+        folded["rows"] += stats["rows"]
+        for group_col, part in stats["groups"].items():
+            previous = folded["groups"].get(group_col)
+            crops, rows, count, mean, m2 = merge_group_statistics([previous, part] if previous else [part])
+            folded["groups"][group_col] = {"crops": crops, "rows": rows, "count": count, "mean": mean, "m2": m2}
+    for group_col, part in folded["groups"].items():
+        # Crop order as a single whole-file groupby would produce it.
+        order = sorted(range(len(part["crops"])), key=part["crops"].__getitem__)
+        folded["groups"][group_col] = {
+            "crops": [part["crops"][i] for i in order],
+            **{key: part[key][order].tolist() for key in ("rows", "count", "mean", "m2")}
         }
-        for crop, group in groups
+    return folded
+
+def merge_crop_statistics(partials):
+    group_col = next((col for col in GROUP_COLUMNS if any(col in part["groups"] for part in partials)), None)
+    if not group_col:
+        raise KeyError(f"No suitable column found in crop statistics ({GROUP_COLUMNS})")
+    crops, rows, count, mean, m2 = merge_group_statistics(
+        [part["groups"][group_col] for part in partials if group_col in part["groups"]])
+    return {
+        "group_col": group_col,
+        "total_rows": sum(part["rows"] for part in partials),
+        "crops": crops,
+        "rows": rows,
+        "count": count,
+        "mean": np.where(count > 0, mean, np.nan),
+        "m2": m2
     }
+
+def merge_group_statistics(parts):
+    # Chan et al. pairwise merge of count/mean/M2, vectorized across crops one part at a time.
+    index = {}
+    for part in parts:
+        for crop in part["crops"]:
+            index.setdefault(crop, len(index))
+    rows = np.zeros(len(index), dtype=np.int64)
+    count = np.zeros((len(index), len(VALUE_COLUMNS)))
+    mean = np.zeros_like(count)
+    m2 = np.zeros_like(count)
+    for part in parts:
+        if not part["crops"]:
+            continue
+        idx = np.array([index[crop] for crop in part["crops"]], dtype=np.intp)
+        n_b = np.asarray(part["count"], dtype=np.float64)
+        n_a = count[idx]
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = np.where(n > 0, n_b / n, 0.0)
+        delta = np.asarray(part["mean"], dtype=np.float64) - mean[idx]
+        mean[idx] += delta * ratio
+        m2[idx] += np.asarray(part["m2"], dtype=np.float64) + delta ** 2 * n_a * ratio
+        count[idx] = n
+        rows[idx] += np.asarray(part["rows"], dtype=np.int64)
+    return list(index), rows, count, mean, m2
+
+def optimal_conditions_from_statistics(merged):
+    # Means plus sample standard deviations (ddof=1, as pandas .std()) from the merged M2.
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(np.where(merged["count"] > 1, merged["m2"] / (merged["count"] - 1), np.nan))
+    order = sorted(range(len(merged["crops"])), key=lambda i: merged["crops"][i])
+    optimal = {}
+    for i in order:
+        entry = {OPTIMUM_KEYS[col]: float(merged["mean"][i, j]) for j, col in enumerate(VALUE_COLUMNS)}
+        entry.update({LEARNED_SIGMA_KEYS[col]: float(std[i, j]) for j, col in enumerate(VALUE_COLUMNS)})
+        optimal[merged["crops"][i]] = entry
     return optimal
 
+def plant_counts_from_statistics(merged):
+    order = np.argsort(-merged["rows"], kind="stable")
+    return {merged["crops"][i]: int(merged["rows"][i]) for i in order if merged["rows"][i] > 0}
+
+def stream_optimal_conditions(folder_path, chunk_rows=STREAM_CHUNK_ROWS, write_counts=True):
+    # Out-of-core replacement for load_local_crop_datasets + export_plant_counts +
+    # compute_optimal_conditions: files -> chunks -> per-crop statistics -> one merge.
+    csv_files = sorted(glob.glob(os.path.join(folder_path, '*.csv')))
+    if not csv_files:
+        print(f"No CSV files found in {folder_path}")
+        return None
+    partials = [file_crop_statistics(path, chunk_rows) for path in csv_files]
+    if not any(part["rows"] for part in partials):
+        return None
+    with trace_stage("groupby", source="stream"):
+        merged = merge_crop_statistics(partials)
+        total_plants, counts = merged["total_rows"], plant_counts_from_statistics(merged)
+        optimal = optimal_conditions_from_statistics(merged)
+    if write_counts:
+        write_plant_counts(total_plants, counts, folder_path)
+    return {"total_plants": total_plants, "counts": counts, "optimal": optimal}
+
+# ----------------------- Optimum Table Cache -----------------------
+
+OPTIMAL_CACHE_DIRNAME = ".optimal_cache"
+OPTIMAL_CACHE_VERSION = 3
+OPTIMAL_CACHE_MAX_ENTRIES = 4
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_json_file(path, default=None):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def write_json_file(path, data):
+    # Write-then-rename so a crash never leaves a half-written cache entry behind.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def fingerprint_csv_files(folder_path, known_hashes=None):
+    # Files whose size and mtime are unchanged reuse their previous content hash,
+    # so a warm fingerprint costs one stat per file instead of re-reading the data.
+    known_hashes = known_hashes or {}
+    files = []
+    for path in sorted(glob.glob(os.path.join(folder_path, '*.csv'))):
+        stat = os.stat(path)
+        known = known_hashes.get(path)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            content_hash = known['sha256']
+        else:
+            content_hash = hash_file(path)
+        files.append({"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                      "sha256": content_hash})
+    key = json.dumps([OPTIMAL_CACHE_VERSION, [(f["path"], f["sha256"]) for f in files]])
+    return hashlib.sha256(key.encode()).hexdigest(), files
+
+def evict_optimal_cache(cache_dir, keep, max_entries=OPTIMAL_CACHE_MAX_ENTRIES):
+    entries = [path for path in glob.glob(os.path.join(cache_dir, '*.json'))
+               if os.path.basename(path) not in ("manifest.json", f"{keep}.json")]
+    # Per-file statistics live in the stats/ subfolder and are pruned by load_file_statistics.
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[max(0, max_entries - 1):]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# Statistics computed by a readonly load, kept until a writable load stores them.
+_unsaved_statistics = {}
+
+def load_file_statistics(files, stats_dir, readonly=False):
+    # Statistics are stored by content hash, so only new or modified files are re-read.
+    # readonly uses whatever is stored but writes and prunes nothing; what it had to compute
+    # is held in memory so the next writable load saves it instead of rescanning the file.
+    if not readonly:
+        os.makedirs(stats_dir, exist_ok=True)
+    partials = []
+    rebuilt = 0
+    for f in files:
+        stats_path = os.path.join(stats_dir, f"{f['sha256']}.json")
+        stats = read_json_file(stats_path)
+        if stats is None or stats.get("version") != OPTIMAL_CACHE_VERSION:
+            with _fetch_lock:
+                stats = _unsaved_statistics.get(stats_path) if readonly else _unsaved_statistics.pop(stats_path, None)
+            if stats is None:
+                stats = {"version": OPTIMAL_CACHE_VERSION, **file_crop_statistics(f["path"])}
+                rebuilt += 1
+            if readonly:
+                with _fetch_lock:
+                    _unsaved_statistics[stats_path] = stats
+            else:
+                write_json_file(stats_path, stats)
+        partials.append(stats)
+    if readonly:
+        print(f"Crop statistics: {rebuilt} of {len(files)} files rescanned")
+        return partials
+    live = {f"{f['sha256']}.json" for f in files}
+    for path in glob.glob(os.path.join(stats_dir, '*.json')):
+        if os.path.basename(path) not in live:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    print(f"Crop statistics: {rebuilt} of {len(files)} files rescanned")
+    return partials
+
+def known_csv_hashes(folder_path, cache_dir=None):
+    # Hashes already recorded by the compiled database or the cache manifest, so a fresh
+    # process fingerprints unchanged files with one stat each instead of re-reading them.
+    database = get_plant_database(folder_path)
+    if database is not None:
+        return {f["path"]: f for f in database.files}
+    cache_dir = cache_dir or os.path.join(folder_path, OPTIMAL_CACHE_DIRNAME)
+    return read_json_file(os.path.join(cache_dir, "manifest.json"), {})
+
+def load_optimal_conditions(folder_path, cache_dir=None, readonly=False):
+    # readonly (the GUI warm-up) reads the compiled database and caches but never creates
+    # folders or writes manifests, cache entries or plant counts.
+    database = get_plant_database(folder_path)
+    if database is not None:
+        # A compiled database is the startup path: its file list doubles as the fingerprint
+        # manifest and its optimum table was aggregated at compile time.
+        digest, files = fingerprint_csv_files(folder_path, {f["path"]: f for f in database.files})
+        if files and digest == database.fingerprint:
+            entry = database.optimum_entry()
+            if entry is not None:
+                trace_count("plant_db.hit")
+                print(f"Loaded optimal conditions for {len(entry['optimal'])} crops from the compiled database")
+            return entry
+        print("⚠️ Compiled plant database is out of date; run compile-db again to use it")
+    cache_dir = cache_dir or os.path.join(folder_path, OPTIMAL_CACHE_DIRNAME)
+    if not readonly:
+        os.makedirs(cache_dir, exist_ok=True)
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+    digest, files = fingerprint_csv_files(folder_path, read_json_file(manifest_path, {}))
+    if not files:
+        print(f"No CSV files found in {folder_path}")
+        return None
+    if not readonly:
+        write_json_file(manifest_path, {f["path"]: f for f in files})
+    entry_path = os.path.join(cache_dir, f"{digest}.json")
+    entry = read_json_file(entry_path)
+    if entry and entry.get("version") == OPTIMAL_CACHE_VERSION:
+        if not readonly:
+            os.utime(entry_path)  # keep recently used entries out of eviction
+        trace_count("optimum_cache.hit")
+        print(f"Loaded optimal conditions for {len(entry['optimal'])} crops from cache")
+        return entry
+    trace_count("optimum_cache.miss")
+    partials = load_file_statistics(files, os.path.join(cache_dir, "stats"), readonly)
+    if not any(part["rows"] for part in partials):
+        return None
+    with trace_stage("groupby", source="statistics"):
+        merged = merge_crop_statistics(partials)
+        total_plants, counts = merged["total_rows"], plant_counts_from_statistics(merged)
+        optimal = optimal_conditions_from_statistics(merged)
+    entry = {
+        "version": OPTIMAL_CACHE_VERSION,
+        "fingerprint": files,
+        "total_plants": total_plants,
+        "counts": counts,
+        "optimal": optimal
+    }
+    if not readonly:
+        write_plant_counts(total_plants, counts, folder_path)
+        write_json_file(entry_path, entry)
+        evict_optimal_cache(cache_dir, keep=digest)
+    return entry
+
+# ----------------------- Compiled Plant Database -----------------------
+
+PLANT_DB_DIRNAME = ".plant_db"
+PLANT_DB_VERSION = 3
+PLANT_DB_CHUNK_ROWS = 1 << 20
+IMAGE_TABLE_FILENAME = "numbers_updated.csv"
+
+def read_image_table(folder_path):
+    path = os.path.join(folder_path, IMAGE_TABLE_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path, usecols=lambda col: col in ('plant_name', 'image_url'), dtype=str)
+    if 'plant_name' not in df.columns or 'image_url' not in df.columns:
+        return {}
+    df = df.dropna().drop_duplicates('plant_name')
+    return dict(zip(df['plant_name'], df['image_url']))
+
+def compile_plant_database(folder_path, output_dir=None, chunk_rows=PLANT_DB_CHUNK_ROWS):
+    # Precomputes everything startup needs from the CSV folder: the optimum table and plant
+    # counts (optimal.json), the image URL table (images.json) and the file fingerprints
+    # (meta.json) that let load_optimal_conditions validate it with one stat per file.
+    # Files are streamed in chunks, so memory stays at one chunk however large the folder is.
+    output_dir = output_dir or os.path.join(folder_path, PLANT_DB_DIRNAME)
+    digest, files = fingerprint_csv_files(folder_path)
+    if not files:
+        print(f"No CSV files found in {folder_path}")
+        return None
+    partials = [file_crop_statistics(f["path"], chunk_rows) for f in files]
+    rows = sum(part["rows"] for part in partials)
+    merged = merge_crop_statistics(partials) if rows else None
+    tmp_dir = f"{output_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    write_json_file(os.path.join(tmp_dir, "images.json"), read_image_table(folder_path))
+    write_json_file(os.path.join(tmp_dir, "meta.json"), {
+        "version": PLANT_DB_VERSION,
+        "fingerprint": digest,
+        "files": files,
+        "rows": rows
+    })
+    if merged is not None:
+        counts = plant_counts_from_statistics(merged)
+        write_json_file(os.path.join(tmp_dir, "optimal.json"), {
+            "version": OPTIMAL_CACHE_VERSION,
+            "fingerprint": files,
+            "total_plants": rows,
+            "counts": counts,
+            "optimal": optimal_conditions_from_statistics(merged)
+        })
+        write_plant_counts(rows, counts, folder_path)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(tmp_dir, output_dir)
+    print(f"Compiled {len(files)} CSV files ({rows} rows) into {output_dir}")
+    return output_dir
+
+class PlantDatabase:
+    def __init__(self, path):
+        self.path = path
+        self.meta = read_json_file(os.path.join(path, "meta.json"))
+        if not self.meta or self.meta.get("version") != PLANT_DB_VERSION:
+            raise ValueError(f"No compiled plant database at {path}")
+        self.fingerprint = self.meta["fingerprint"]
+        self.files = self.meta["files"]
+        self._images = None
+    def __len__(self):
+        return self.meta["rows"]
+    @property
+    def images(self):
+        if self._images is None:
+            self._images = read_json_file(os.path.join(self.path, "images.json"), {})
+        return self._images
+    def optimum_entry(self):
+        # The load_optimal_conditions entry aggregated at compile time.
+        entry = read_json_file(os.path.join(self.path, "optimal.json"))
+        return entry if entry and entry.get("version") == OPTIMAL_CACHE_VERSION else None
+
+_plant_databases = {}
+
+def get_plant_database(folder_path):
+    # Opened once per process; reopened only when the compiled artifact is replaced.
+    path = os.path.join(folder_path, PLANT_DB_DIRNAME)
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    stamp = os.stat(meta_path).st_mtime_ns
+    cached = _plant_databases.get(path)
+    if cached is None or cached[0] != stamp:
+        try:
+            cached = (stamp, PlantDatabase(path))
+        except (ValueError, OSError) as e:
+            print(f"⚠️ Ignoring compiled plant database: {e}")
+            return None
+        _plant_databases[path] = cached
+    return cached[1]
+
+_image_urls = {}
+
+def load_image_urls(folder_path):
+    # plant_name -> image_url, built once per process and rebuilt only when its source changes.
+    database = get_plant_database(folder_path)
+    if database is not None:
+        stamp = ("db", id(database))
+    else:
+        try:
+            stat = os.stat(os.path.join(folder_path, IMAGE_TABLE_FILENAME))
+            stamp = ("csv", stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            stamp = None
+    cached = _image_urls.get(folder_path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, database.images if database is not None else read_image_table(folder_path))
+        _image_urls[folder_path] = cached
+    return cached[1]
+
 def plant_fitness(sensor, optimal, sigmas, weights):
     T_opt = optimal['T_opt']
     H_opt = optimal['H_opt']
@@ -255,6 +1586,8 @@ def plant_fitness(sensor, optimal, sigmas, weights):
     return exp(-exponent)
 
 def get_sensor_data_from_report(report):
+    if isinstance(report, LocationReport):
+        return report.to_sensor_data()
     sensor_data = {}
     keys = {
         'T': ('Weather Data', 'Temperature'),
@@ -266,8 +1599,12 @@ def get_sensor_data_from_report(report):
     }
     for key, (section, subkey) in keys.items():
         try:
-            value = report.get(section, {}).get(subkey, None)
-            sensor_data[key] = float(value) if value and value.strip() else None
+            # Sections that failed to load are plain strings rather than dicts.
+            section_data = report.get(section)
+            value = section_data.get(subkey, None) if isinstance(section_data, dict) else None
+            if isinstance(value, str):
+                value = value.strip() or None
+            sensor_data[key] = float(value) if value is not None else None
         except (ValueError, TypeError):
             sensor_data[key] = None
     return sensor_data
@@ -293,41 +1630,1235 @@ def prompt_for_missing_data(sensor_data, prompts, valid_ranges):
     return sensor_data
 
 def recommend_crop(sensor_data, optimal_conditions, sigmas, weights):
-    crop_fitness = {crop: plant_fitness(sensor_data, optimal, sigmas, weights)
-                    for crop, optimal in optimal_conditions.items()}
+    with trace_stage("scoring", crops=len(optimal_conditions), engine="scalar"):
+        crop_fitness = {crop: plant_fitness(sensor_data, optimal, sigmas, weights)
+                        for crop, optimal in optimal_conditions.items()}
     best_crop = max(crop_fitness, key=crop_fitness.get)
     return best_crop, crop_fitness[best_crop], crop_fitness
 
-def look_at_image(optimal_crop):
+# ----------------------- Vectorized Scoring Engine -----------------------
+
+# Column order shared by sensor readings, the optimum table and the sigma/weight vectors.
+SENSOR_KEYS = ['T', 'H', 'P', 'T_avg', 'AP', 'pH']
+SIGMA_KEYS = ['sigma_T', 'sigma_H', 'sigma_P', 'sigma_Tavg', 'sigma_AP', 'sigma_pH']
+WEIGHT_KEYS = ['w_T', 'w_H', 'w_P', 'w_Tavg', 'w_AP', 'w_pH']
+DEFAULT_P_OPT = 1013
+RESULT_SHORTLIST_SIZE = 5
+
+DEFAULT_SIGMAS = {
+    'sigma_T': 2.0,
+    'sigma_H': 10.0,
+    'sigma_P': 10.0,
+    'sigma_Tavg': 2.0,
+    'sigma_AP': 20.0,
+    'sigma_pH': 0.5
+}
+
+DEFAULT_WEIGHTS = {
+    'w_T': 0.35,
+    'w_H': 0.30,
+    'w_P': 0.05,
+    'w_Tavg': 0.15,
+    'w_AP': 0.10,
+    'w_pH': 0.05
+}
+
+def sensor_vector(sensor_data):
+    return np.array([np.nan if sensor_data.get(key) is None else float(sensor_data[key])
+                     for key in SENSOR_KEYS], dtype=np.float64)
+
+# Which learned per-crop sigma each sensor column uses (T_avg shares the temperature spread).
+LEARNED_SIGMA_SOURCES = {
+    'sigma_T': 'sigma_T',
+    'sigma_H': 'sigma_H',
+    'sigma_P': 'sigma_P',
+    'sigma_Tavg': 'sigma_T',
+    'sigma_AP': 'sigma_AP',
+    'sigma_pH': 'sigma_pH'
+}
+# Learned spreads below this fraction of the default are clamped so one tight crop can't dominate.
+LEARNED_SIGMA_FLOOR = 0.1
+LEARNED_SIGMAS = False
+
+def optimal_conditions_to_array(optimal_conditions, learned=False):
+    crops = list(optimal_conditions)
+    table = np.empty((len(crops), len(SENSOR_KEYS)), dtype=np.float64)
+    for i, crop in enumerate(crops):
+        optimal = optimal_conditions[crop]
+        # Same layout plant_fitness uses: constant P_opt and T_avg_opt = T_opt.
+        p_opt = optimal.get('P_opt', np.nan) if learned else DEFAULT_P_OPT
+        table[i] = (optimal['T_opt'], optimal['H_opt'], DEFAULT_P_OPT if np.isnan(p_opt) else p_opt,
+                    optimal['T_opt'], optimal['AP_opt'], optimal['pH_opt'])
+    return crops, table
+
+def learned_sigma_table(optimal_conditions, sigmas):
+    # Per-crop sigma matrix in SIGMA_KEYS order; missing or degenerate spreads fall back to sigmas.
+    defaults = np.array([sigmas[key] for key in SIGMA_KEYS], dtype=np.float64)
+    table = np.array([[optimal.get(LEARNED_SIGMA_SOURCES[key], np.nan) for key in SIGMA_KEYS]
+                      for optimal in optimal_conditions.values()], dtype=np.float64).reshape(-1, len(SIGMA_KEYS))
+    table = np.where(np.isfinite(table) & (table > 0), table, defaults)
+    return np.maximum(table, defaults * LEARNED_SIGMA_FLOOR)
+
+class CropScorer:
+    def __init__(self, crops, optimal, sigmas, weights, block_elements=1 << 22):
+        self.crops = list(crops)
+        self.optimal = np.ascontiguousarray(optimal, dtype=np.float64)
+        if self.optimal.shape != (len(self.crops), len(SENSOR_KEYS)):
+            raise ValueError(f"Optimum table shape {self.optimal.shape} does not match "
+                             f"{len(self.crops)} crops x {len(SENSOR_KEYS)} columns")
+        # sigmas is either a dict shared by every crop or an (n_crops x 6) array in SIGMA_KEYS order.
+        if isinstance(sigmas, dict):
+            sigmas = [sigmas[key] for key in SIGMA_KEYS]
+        self.sigmas = np.broadcast_to(np.asarray(sigmas, dtype=np.float64), self.optimal.shape)
+        self.weights = np.array([weights[key] for key in WEIGHT_KEYS], dtype=np.float64)
+        # w / (2 sigma^2) per crop and column.
+        self.coefficients = self.weights / (2 * self.sigmas ** 2)
+        # sum_k c_k (x_k - o_k)^2 expanded to x^2.c - 2x.(c*o) + (c*o^2).1 so a block of readings
+        # is scored by a single (readings x 13) @ (13 x crops) product, whatever sigmas look like.
+        self.projection = np.ascontiguousarray(np.vstack([
+            self.coefficients.T,
+            -2 * (self.coefficients * self.optimal).T,
+            (self.coefficients * self.optimal ** 2).sum(axis=1)[np.newaxis, :]
+        ]))
+        # Upper bound on the (readings x crops) block scored at once.
+        self.block_elements = block_elements
+    @classmethod
+    def from_optimal_conditions(cls, optimal_conditions, sigmas, weights, learned=False):
+        crops, table = optimal_conditions_to_array(optimal_conditions, learned)
+        if learned:
+            sigmas = learned_sigma_table(optimal_conditions, sigmas)
+        return cls(crops, table, sigmas, weights)
+    def _block_rows(self):
+        return max(1, self.block_elements // max(1, len(self.crops)))
+    def _score_block(self, readings):
+        features = np.hstack([readings * readings, readings, np.ones((readings.shape[0], 1))])
+        exponent = features @ self.projection
+        # Rounding in the expansion can leave a tiny negative where a reading matches an optimum.
+        np.maximum(exponent, 0, out=exponent)
+        return np.exp(-exponent, out=exponent)
+    def score(self, readings):
+        readings = np.asarray(readings, dtype=np.float64)
+        if readings.ndim == 1:
+            with trace_stage("scoring", crops=len(self.crops), readings=1):
+                return self._score_block(readings[np.newaxis, :])[0]
+        scores = np.empty((readings.shape[0], len(self.crops)), dtype=np.float64)
+        step = self._block_rows()
+        with trace_stage("scoring", crops=len(self.crops), readings=readings.shape[0]):
+            for start in range(0, readings.shape[0], step):
+                scores[start:start + step] = self._score_block(readings[start:start + step])
+        return scores
+    def best(self, readings):
+        best_index, best_score, _, _ = self.rank(readings)
+        return best_index, best_score
+    def rank(self, readings, k=0, min_score=None):
+        # best() plus, when k > 0, each reading's top_k_indices padded with -1 / NaN.
+        readings = np.atleast_2d(np.asarray(readings, dtype=np.float64))
+        n_readings = readings.shape[0]
+        k = max(min(k, len(self.crops)), 0)
+        best_index = np.empty(n_readings, dtype=np.intp)
+        best_score = np.empty(n_readings, dtype=np.float64)
+        top_index = np.full((n_readings, k), -1, dtype=np.intp)
+        top_score = np.full((n_readings, k), np.nan, dtype=np.float64)
+        step = self._block_rows()
+        with trace_stage("scoring", crops=len(self.crops), readings=n_readings):
+            for start in range(0, n_readings, step):
+                block = self._score_block(readings[start:start + step])
+                rows = slice(start, start + block.shape[0])
+                idx = block.argmax(axis=1)
+                best_index[rows] = idx
+                best_score[rows] = block[np.arange(block.shape[0]), idx]
+                if k:
+                    top_index[rows], top_score[rows] = top_k_rows(block, k, min_score)
+        return best_index, best_score, top_index, top_score
+    def top_k(self, reading, k, min_score=None):
+        if isinstance(reading, dict):
+            reading = sensor_vector(reading)
+        scores = self.score(reading)
+        return [(self.crops[i], float(scores[i])) for i in top_k_indices(scores, k, min_score)]
+
+def top_k_indices(scores, k, min_score=None):
+    # Same order as a stable descending sort of the full vector (ties keep crop order),
+    # but only the k survivors of a partial selection are ever sorted.
+    scores = np.asarray(scores, dtype=np.float64)
+    keep = ~np.isnan(scores)
+    if min_score is not None:
+        keep &= scores >= min_score
+    candidates = np.flatnonzero(keep)
+    k = min(k, candidates.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    values = scores[candidates]
+    if k < candidates.size:
+        kth = np.partition(values, values.size - k)[values.size - k]
+        above = candidates[values > kth]
+        ties = candidates[values == kth][:k - above.size]
+        candidates = np.concatenate([above, ties])
+        values = scores[candidates]
+    return candidates[np.lexsort((candidates, -values))]
+
+SCORER_CACHE_ENTRIES = 4
+_crop_scorers = OrderedDict()
+_crop_scorers_lock = threading.Lock()
+
+def get_crop_scorer(optimal_conditions, sigmas, weights, learned=False):
+    # Building a CropScorer walks every crop dict in Python, so it is done once per optimum
+    # table. Tables are matched by identity (the cache holds a reference, so an id cannot be
+    # reused); replace the dict rather than editing it in place to pick up new optima.
+    key = (id(optimal_conditions), json.dumps(sigmas, sort_keys=True, default=str),
+           json.dumps(weights, sort_keys=True), learned)
+    with _crop_scorers_lock:
+        cached = _crop_scorers.get(key)
+        if cached is not None and cached[0] is optimal_conditions and cached[1] == len(optimal_conditions):
+            _crop_scorers.move_to_end(key)
+            return cached[2]
+    scorer = CropScorer.from_optimal_conditions(optimal_conditions, sigmas, weights, learned)
+    with _crop_scorers_lock:
+        _crop_scorers[key] = (optimal_conditions, len(optimal_conditions), scorer)
+        while len(_crop_scorers) > SCORER_CACHE_ENTRIES:
+            _crop_scorers.popitem(last=False)
+    return scorer
+
+def recommend_top_crops(sensor_data, optimal_conditions, sigmas=DEFAULT_SIGMAS, weights=DEFAULT_WEIGHTS, k=5,
+                        min_score=None, learned=False):
+    # optimal_conditions is either the optimum dict or a CropScorer already built from it.
+    if isinstance(optimal_conditions, CropScorer):
+        scorer = optimal_conditions
+    else:
+        scorer = get_crop_scorer(optimal_conditions, sigmas, weights, learned)
+    return scorer.top_k(sensor_data, k, min_score)
+
+def top_k_rows(scores, k, min_score=None):
+    # top_k_indices for every row of a (readings x crops) block, padded with -1 / NaN where a
+    # row has fewer than k candidates.
+    n_rows, n_crops = scores.shape
+    k = min(k, n_crops)
+    if k <= 0:
+        return np.empty((n_rows, 0), dtype=np.intp), np.empty((n_rows, 0), dtype=np.float64)
+    masked = np.where(np.isnan(scores), -np.inf, scores)
+    if min_score is not None:
+        masked[masked < min_score] = -np.inf
+    if k < n_crops:
+        picked = np.argpartition(-masked, k - 1, axis=1)[:, :k]
+    else:
+        picked = np.broadcast_to(np.arange(n_crops), (n_rows, n_crops))
+    values = np.take_along_axis(masked, picked, axis=1)
+    order = np.lexsort((picked, -values), axis=1)
+    picked = np.take_along_axis(picked, order, axis=1)
+    values = np.take_along_axis(values, order, axis=1)
+    if k < n_crops:
+        # argpartition breaks ties at the k-th score arbitrarily; redo the rows where that
+        # could have kept a later crop than the stable sort would.
+        kth = values[:, -1:]
+        ambiguous = np.isfinite(kth[:, 0]) & ((masked == kth).sum(axis=1) > (values == kth).sum(axis=1))
+        for row in np.flatnonzero(ambiguous):
+            picked[row] = top_k_indices(scores[row], k, min_score)
+            values[row] = scores[row, picked[row]]
+    missing = np.isneginf(values)
+    picked[missing] = -1
+    values[missing] = np.nan
+    return picked, values
+
+# ----------------------- Parallel Batch Scoring -----------------------
+
+PARALLEL_WORKERS = os.cpu_count() or 1
+# Fixed shard size, independent of the worker count, so every run splits the readings (and
+# rounds the GEMM) the same way and results are identical however many workers there are.
+PARALLEL_SHARD_ROWS = 1 << 15
+
+class SharedArray:
+    # A numpy array over a multiprocessing.shared_memory block; other processes map the same
+    # block by name from spec() instead of receiving a pickled copy.
+    def __init__(self, shape, dtype, name=None):
+        from multiprocessing import shared_memory  # local import
+        self.shape = tuple(int(n) for n in shape)
+        self.dtype = np.dtype(dtype).str
+        self.owner = name is None
+        size = max(1, int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize)
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.memory.buf)
+    @classmethod
+    def from_array(cls, values, dtype=None):
+        values = np.asarray(values, dtype=dtype)
+        shared = cls(values.shape, values.dtype)
+        shared.array[...] = values
+        return shared
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype = spec
+        return cls(shape, dtype, name)
+    def spec(self):
+        return self.memory.name, self.shape, self.dtype
+    def close(self):
+        # Views of self.array must be gone first; copy results out before closing.
+        self.array = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+_parallel_worker = {}
+
+BLAS_THREAD_VARIABLES = ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS")
+
+@contextmanager
+def single_threaded_blas():
+    # One BLAS thread per process, so N workers keep N cores busy rather than N x BLAS threads.
+    # A spawned worker imports numpy while unpickling its target, before any initializer runs,
+    # so the limits have to be in the parent's environment whenever the pool starts a worker.
+    saved = {var: os.environ.get(var) for var in BLAS_THREAD_VARIABLES}
+    os.environ.update(dict.fromkeys(BLAS_THREAD_VARIABLES, "1"))
     try:
-        df_numbers = pd.read_csv('/Users/michael_z/Downloads/Plant Database/numbers_updated.csv')
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to open CSV file: {e}")
-        return
-    row = df_numbers[df_numbers['plant_name'] == optimal_crop]
-    if row.empty:
-        messagebox.showerror("Error", f"Plant '{optimal_crop}' not found in CSV.")
-        return
-    image_url = row.iloc[0].get('image_url')
-    if pd.isnull(image_url) or not image_url:
-        messagebox.showerror("Error", f"No image URL for {optimal_crop}.")
-        return
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+def _init_parallel_worker(table_specs):
+    optimal, sigmas, weights = (SharedArray.attach(spec) for spec in table_specs)
+    _parallel_worker["tables"] = (optimal, sigmas, weights)
+    _parallel_worker["scorer"] = CropScorer(range(optimal.shape[0]), optimal.array, sigmas.array,
+                                            dict(zip(WEIGHT_KEYS, weights.array)))
+
+def _score_parallel_shard(io_specs, start, stop, k, min_score):
+    buffers = [SharedArray.attach(spec) for spec in io_specs]
     try:
-        response = requests.get(image_url, timeout=10)
+        readings, best_index, best_score, top_index, top_score = (buffer.array for buffer in buffers)
+        ranked = _parallel_worker["scorer"].rank(readings[start:stop], k, min_score)
+        best_index[start:stop], best_score[start:stop] = ranked[0], ranked[1]
+        if k:
+            top_index[start:stop], top_score[start:stop] = ranked[2], ranked[3]
+        del readings, best_index, best_score, top_index, top_score, ranked
+    finally:
+        for buffer in buffers:
+            buffer.close()
+    return start, stop
+
+def _parallel_worker_pid(hold):
+    # Holding the worker briefly lets the other start-up tasks reach the other workers.
+    time.sleep(hold)
+    return os.getpid()
+
+class ParallelScorer:
+    # CropScorer.rank over a process pool. The crop tables go into shared memory once and each
+    # worker builds its own CropScorer on them at start-up; readings and results are shared
+    # blocks too, so a task only carries its (start, stop) row range.
+    def __init__(self, crops, optimal, sigmas, weights, workers=PARALLEL_WORKERS, shard_rows=PARALLEL_SHARD_ROWS):
+        import multiprocessing  # local import
+        # Validates the tables here rather than in every worker.
+        scorer = CropScorer(crops, optimal, sigmas, weights)
+        self.crops = scorer.crops
+        self.workers = max(1, workers)
+        self.shard_rows = shard_rows
+        self.tables = [SharedArray.from_array(scorer.optimal), SharedArray.from_array(scorer.sigmas),
+                       SharedArray.from_array(scorer.weights)]
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_init_parallel_worker,
+                                        initargs=([table.spec() for table in self.tables],))
+    @classmethod
+    def from_optimal_conditions(cls, optimal_conditions, sigmas, weights, learned=False, **options):
+        crops, table = optimal_conditions_to_array(optimal_conditions, learned)
+        if learned:
+            sigmas = learned_sigma_table(optimal_conditions, sigmas)
+        return cls(crops, table, sigmas, weights, **options)
+    @classmethod
+    def from_scorer(cls, scorer, **options):
+        return cls(scorer.crops, scorer.optimal, scorer.sigmas, dict(zip(WEIGHT_KEYS, scorer.weights)), **options)
+    def start(self, timeout=60.0):
+        # Workers are spawned on demand; start them all and wait until each has built its
+        # scorer, so nothing timed afterwards pays for start-up. Returns the worker pids.
+        pids = set()
+        deadline = time.perf_counter() + timeout
+        while len(pids) < self.workers and time.perf_counter() < deadline:
+            # Workers are started inside submit(), so that is where the BLAS limits apply.
+            with single_threaded_blas():
+                futures = [self.pool.submit(_parallel_worker_pid, 0.05) for _ in range(self.workers)]
+            pids.update(future.result() for future in futures)
+        return pids
+    def rank(self, readings, k=0, min_score=None):
+        readings = np.atleast_2d(np.asarray(readings, dtype=np.float64))
+        n_readings = readings.shape[0]
+        k = max(min(k, len(self.crops)), 0)
+        buffers = [SharedArray.from_array(readings),
+                   SharedArray((n_readings,), np.intp), SharedArray((n_readings,), np.float64),
+                   SharedArray((n_readings, k), np.intp), SharedArray((n_readings, k), np.float64)]
+        try:
+            specs = [buffer.spec() for buffer in buffers]
+            shards = range(0, n_readings, self.shard_rows)
+            with trace_stage("parallel_scoring", crops=len(self.crops), readings=n_readings,
+                             workers=self.workers, shards=len(shards)):
+                with single_threaded_blas():
+                    futures = [self.pool.submit(_score_parallel_shard, specs, start,
+                                                min(start + self.shard_rows, n_readings), k, min_score)
+                               for start in shards]
+                for future in futures:
+                    future.result()
+            return tuple(buffer.array.copy() for buffer in buffers[1:])
+        finally:
+            for buffer in buffers:
+                buffer.close()
+    def best(self, readings):
+        best_index, best_score, _, _ = self.rank(readings)
+        return best_index, best_score
+    def recommend_many(self, readings, k=0, min_score=None):
+        # (best_crop, score, [(crop, score), ...]) per reading, in input order.
+        best_index, best_score, top_index, top_score = self.rank(readings, k, min_score)
+        return [(self.crops[best], float(score),
+                 [(self.crops[i], float(s)) for i, s in zip(row_index, row_score) if i >= 0])
+                for best, score, row_index, row_score in zip(best_index, best_score, top_index, top_score)]
+    def close(self):
+        self.pool.shutdown()
+        for table in self.tables:
+            table.close()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+
+def score_readings_file(input_path, output_path, folder_path=PLANT_DATABASE_FOLDER, workers=PARALLEL_WORKERS,
+                        top_k=RESULT_SHORTLIST_SIZE):
+    # Offline counterpart of `batch` for readings that are already measured: no provider calls,
+    # just the best crop (and optional shortlist) for every row, scored on all cores.
+    table = load_optimal_conditions(folder_path)
+    if table is None:
+        raise FileNotFoundError(f"No crop data found in {folder_path}")
+    readings = pd.read_parquet(input_path) if input_path.endswith('.parquet') else pd.read_csv(input_path)
+    missing = [key for key in SENSOR_KEYS if key not in readings.columns]
+    if missing:
+        raise KeyError(f"Readings file is missing columns {missing}")
+    values = readings[SENSOR_KEYS].to_numpy(dtype=np.float64)
+    complete = ~np.isnan(values).any(axis=1)
+    start = time.perf_counter()
+    with ParallelScorer.from_optimal_conditions(table["optimal"], DEFAULT_SIGMAS, DEFAULT_WEIGHTS, LEARNED_SIGMAS,
+                                                workers=workers) as scorer:
+        best_index, best_score, top_index, top_score = scorer.rank(values, top_k)
+        crops = np.array(scorer.crops, dtype=object)
+    elapsed = time.perf_counter() - start
+    readings['best_crop'] = np.where(complete, crops[best_index], '')
+    readings['fitness'] = np.where(complete, best_score, np.nan)
+    if top_k:
+        readings['top_crops'] = [';'.join(f"{crops[i]}:{score:.6f}" for i, score in zip(row_index, row_score) if i >= 0)
+                                 if ok else '' for ok, row_index, row_score in zip(complete, top_index, top_score)]
+    if output_path.endswith('.parquet'):
+        readings.to_parquet(output_path, index=False)
+    else:
+        readings.to_csv(output_path, index=False)
+    rate = len(readings) / elapsed if elapsed else 0.0
+    print(f"✅ Scored {len(readings)} readings against {len(crops)} crops on {workers} workers "
+          f"in {elapsed:.1f}s ({rate:,.0f} readings/sec), {int((~complete).sum())} incomplete")
+    return {"readings": len(readings), "incomplete": int((~complete).sum()), "seconds": elapsed}
+
+# ----------------------- Image Cache -----------------------
+
+IMAGE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".gardener_cache", "images")
+IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+IMAGE_THUMBNAIL_SIZE = (600, 600)
+IMAGE_MEMORY_ENTRIES = 32
+IMAGE_PREFETCH_TOP_K = RESULT_SHORTLIST_SIZE
+
+class ImageCache:
+    # Downloads are stored by the sha256 of their bytes next to a pre-generated thumbnail;
+    # index.json maps each URL to its digest. File mtimes double as LRU order for eviction.
+    def __init__(self, directory=IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES,
+                 thumbnail_size=IMAGE_THUMBNAIL_SIZE, memory_entries=IMAGE_MEMORY_ENTRIES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.thumbnail_size = thumbnail_size
+        self.memory_entries = memory_entries
+        for sub in ("originals", "thumbnails"):
+            os.makedirs(os.path.join(directory, sub), exist_ok=True)
+        self.index_path = os.path.join(directory, "index.json")
+        self.urls = read_json_file(self.index_path, {})
+        self.memory = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+    def original_path(self, digest):
+        return os.path.join(self.directory, "originals", digest)
+    def thumbnail_path(self, digest):
+        return os.path.join(self.directory, "thumbnails", f"{digest}.png")
+    def get_thumbnail(self, url):
+        # Waits for an in-flight prefetch of the same URL instead of downloading it twice.
+        with self.lock:
+            future = self.pending.get(url)
+        if future is not None:
+            return future.result()
+        return self._load(url)
+    def prefetch(self, urls):
+        executor = get_fetch_executor()
+        with self.lock:
+            for url in urls:
+                if url in self.memory or url in self.pending:
+                    continue
+                future = executor.submit(self._load, url)
+                self.pending[url] = future
+                future.add_done_callback(lambda f, url=url: self._finish_prefetch(url))
+    def _finish_prefetch(self, url):
+        with self.lock:
+            self.pending.pop(url, None)
+    def _load(self, url):
+        with self.lock:
+            image = self.memory.get(url)
+            if image is not None:
+                self.memory.move_to_end(url)
+                trace_count("image_cache.memory_hit")
+                return image
+            digest = self.urls.get(url)
+        from PIL import Image  # local import
+        path = self.thumbnail_path(digest) if digest else None
+        if path and os.path.exists(path):
+            os.utime(path)
+            trace_count("image_cache.disk_hit")
+        else:
+            trace_count("image_cache.miss")
+            path = self.thumbnail_path(self._download(url))
+        image = Image.open(path)
+        image.load()
+        with self.lock:
+            self.memory[url] = image
+            while len(self.memory) > self.memory_entries:
+                self.memory.popitem(last=False)
+        return image
+    def _download(self, url):
+        with host_semaphore(url):
+            response = get_http_session().get(url, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
-        image_data = BytesIO(response.content)
-        pil_image = Image.open(image_data)
+        data = response.content
+        digest = hashlib.sha256(data).hexdigest()
+        original = self.original_path(digest)
+        if not os.path.exists(original):
+            self._write_atomic(original, lambda f: f.write(data))
+        thumbnail = self.thumbnail_path(digest)
+        if not os.path.exists(thumbnail):
+            from PIL import Image  # local import
+            pil_image = Image.open(BytesIO(data))
+            pil_image.thumbnail(self.thumbnail_size)
+            if pil_image.mode not in ("RGB", "RGBA"):
+                pil_image = pil_image.convert("RGBA" if "transparency" in pil_image.info else "RGB")
+            self._write_atomic(thumbnail, lambda f: pil_image.save(f, format="PNG"))
+        with self.lock:
+            self.urls[url] = digest
+            write_json_file(self.index_path, self.urls)
+        self.evict(keep=digest)
+        return digest
+    def _write_atomic(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    def evict(self, keep=None):
+        # Drops least recently used files until the cache fits; index entries pointing at
+        # an evicted digest simply download again.
+        keep_paths = {self.original_path(keep), self.thumbnail_path(keep)} if keep else set()
+        files = []
+        for sub in ("originals", "thumbnails"):
+            for entry in os.scandir(os.path.join(self.directory, sub)):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if path in keep_paths:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        return total
+
+_image_cache = None
+
+def get_image_cache():
+    global _image_cache
+    with _fetch_lock:
+        if _image_cache is None:
+            _image_cache = ImageCache()
+        return _image_cache
+
+def set_image_cache(cache):
+    global _image_cache
+    with _fetch_lock:
+        _image_cache = cache
+
+def crop_image_url(crop):
+    try:
+        image_urls = load_image_urls(PLANT_DATABASE_FOLDER)
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to load image: {e}")
+        raise ValueError(f"Failed to open CSV file: {e}") from e
+    if crop not in image_urls:
+        raise ValueError(f"Plant '{crop}' not found in CSV.")
+    if not image_urls[crop]:
+        raise ValueError(f"No image URL for {crop}.")
+    return image_urls[crop]
+
+def prefetch_crop_images(job, crops):
+    image_urls = load_image_urls(PLANT_DATABASE_FOLDER)
+    get_image_cache().prefetch([image_urls[crop] for crop in crops if image_urls.get(crop)])
+
+def look_at_image(optimal_crop, worker=None):
+    # With a worker, the lookup, download and thumbnailing happen off the Tk thread.
+    def load(job):
+        image_url = crop_image_url(optimal_crop)
+        try:
+            return get_image_cache().get_thumbnail(image_url)
+        except Exception as e:
+            raise ValueError(f"Failed to load image: {e}") from e
+    def show(pil_image):
+        from PIL import ImageTk  # local import
+        img_win = tk.Toplevel()
+        img_win.title(f"Image of {optimal_crop}")
+        img = ImageTk.PhotoImage(pil_image)
+        img_win.image = img  # Prevent garbage collection
+        lbl_img = tk.Label(img_win, image=img)
+        lbl_img.pack(padx=10, pady=10)
+    if worker is not None:
+        worker.submit(load, on_done=show, on_error=lambda e: messagebox.showerror("Error", str(e)))
         return
-    img_win = tk.Toplevel()
-    img_win.title(f"Image of {optimal_crop}")
-    max_width, max_height = 600, 600
-    pil_image.thumbnail((max_width, max_height))
-    img = ImageTk.PhotoImage(pil_image)
-    img_win.image = img  # Prevent garbage collection
-    lbl_img = tk.Label(img_win, image=img)
-    lbl_img.pack(padx=10, pady=10)
+    try:
+        pil_image = load(None)
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
+        return
+    show(pil_image)
+
+# ----------------------- Batch Location Reports -----------------------
+
+BATCH_WORKERS = 8
+BATCH_RETRIES = 2
+BATCH_RETRY_BACKOFF = 1.0
+BATCH_PROGRESS_EVERY = 100
+BATCH_OUTPUT_COLUMNS = ['id', 'lat', 'lon', 'month', 'year'] + SENSOR_KEYS + \
+                       ['best_crop', 'fitness', 'top_crops', 'status', 'attempts']
+
+def read_batch_points(input_path):
+    if input_path.endswith('.parquet'):
+        points = pd.read_parquet(input_path)
+    else:
+        points = pd.read_csv(input_path)
+    missing = [col for col in ['lat', 'lon', 'month', 'year'] if col not in points.columns]
+    if missing:
+        raise KeyError(f"Batch input is missing columns {missing}")
+    if 'id' not in points.columns:
+        points['id'] = points.index
+    points['id'] = points['id'].astype(str)
+    return points[['id', 'lat', 'lon', 'month', 'year']]
+
+def read_batch_checkpoint(output_path):
+    # The output file doubles as the checkpoint: every id written with status ok is done.
+    # Rows left incomplete (e.g. by a provider outage) are dropped from the file so they are
+    # retried and written again rather than duplicated.
+    if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        return set()
+    with open(output_path, 'r', newline='') as f:
+        rows = [row for row in csv.DictReader(f) if row.get('id')]
+    done = [row for row in rows if row.get('status') == 'ok']
+    if len(done) < len(rows):
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=BATCH_OUTPUT_COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(done)
+        os.replace(tmp_path, output_path)
+        print(f"Batch: retrying {len(rows) - len(done)} incomplete points from the previous run")
+    return {row['id'] for row in done}
+
+def score_batch_point(point, scorer, top_k=RESULT_SHORTLIST_SIZE, retries=BATCH_RETRIES):
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            report = get_location_report(point['lat'], point['lon'], int(point['month']), int(point['year']))
+            sensor_data = report.to_sensor_data()
+        except Exception as e:
+            print(f"❌ Point {point['id']} failed: {e}")
+            sensor_data = dict.fromkeys(SENSOR_KEYS)
+        missing = [key for key in SENSOR_KEYS if sensor_data[key] is None]
+        if not missing or attempts > retries:
+            break
+        trace_count("retries.batch", point=point['id'])
+        time.sleep(BATCH_RETRY_BACKOFF * 2 ** (attempts - 1))
+    row = {**point, **sensor_data, 'attempts': attempts}
+    if missing:
+        # Headless runs cannot prompt, so incomplete points are written without a score.
+        row.update(best_crop='', fitness='', top_crops='', status=f"missing:{'|'.join(missing)}")
+        return row
+    shortlist = scorer.top_k(sensor_data, top_k)
+    row.update(best_crop=shortlist[0][0], fitness=shortlist[0][1],
+               top_crops=';'.join(f"{crop}:{score:.6f}" for crop, score in shortlist), status='ok')
+    return row
+
+def run_batch(input_path, output_path, folder_path=PLANT_DATABASE_FOLDER, workers=BATCH_WORKERS,
+              retries=BATCH_RETRIES, top_k=RESULT_SHORTLIST_SIZE):
+    table = load_optimal_conditions(folder_path)
+    if table is None:
+        raise FileNotFoundError(f"No crop data found in {folder_path}")
+    scorer = CropScorer.from_optimal_conditions(table["optimal"], DEFAULT_SIGMAS, DEFAULT_WEIGHTS, LEARNED_SIGMAS)
+    points = read_batch_points(input_path)
+    done = read_batch_checkpoint(output_path)
+    todo = [point for point in points.to_dict('records') if point['id'] not in done]
+    # Warm the elevation cache in packed requests so per-point lookups never hit the network;
+    # points the spatial index can answer from a neighbour are left out.
+    index = get_spatial_index()
+    seeds = index.uncovered("elevation", [(point['lat'], point['lon']) for point in todo])
+    for (lat, lon), elevation in zip(seeds, get_terrain_data_bulk(seeds)):
+        index.add("elevation", lat, lon, to_float(elevation), ttl=CACHE_TTLS["terrain"])
+    pending = iter(todo)
+    print(f"Batch: {len(points)} points, {len(done)} already done, writing to {output_path}")
+    write_header = not done and (not os.path.exists(output_path) or os.path.getsize(output_path) == 0)
+    completed = 0
+    start = time.perf_counter()
+    with open(output_path, 'a', newline='') as f, ThreadPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(f, fieldnames=BATCH_OUTPUT_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        in_flight = set()
+        while True:
+            # Keep a bounded window of points in flight rather than queueing the whole file.
+            for point in pending:
+                in_flight.add(executor.submit(score_batch_point, point, scorer, top_k, retries))
+                if len(in_flight) >= workers * 2:
+                    break
+            if not in_flight:
+                break
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                writer.writerow(future.result())
+                completed += 1
+            f.flush()
+            if completed % BATCH_PROGRESS_EVERY < len(finished):
+                elapsed = time.perf_counter() - start
+                print(f"Batch: {completed} points done ({completed / elapsed:.1f} points/sec)")
+    elapsed = time.perf_counter() - start
+    rate = completed / elapsed if elapsed else 0.0
+    print(f"Batch finished: {completed} points in {elapsed:.1f}s ({rate:.1f} points/sec)")
+    index.report()
+    get_response_cache().report()
+    return {"points": completed, "skipped": len(done), "seconds": elapsed, "points_per_sec": rate}
+
+# ----------------------- Planting Calendar -----------------------
+
+CALENDAR_YEARS = 1
+# Humidity and surface pressure come from the same POWER request as temperature and rain.
+CALENDAR_POWER_PARAMETERS = "T2M,PRECTOT,RH2M,PS"
+
+def daily_series_arrays(series):
+    # {YYYYMMDD: value} as (int YYYYMMDD dates, float values); None and NASA's -999 fill become NaN.
+    dates = np.fromiter((int(day) for day in series), dtype=np.int64, count=len(series))
+    values = np.array([np.nan if value is None else value for value in series.values()], dtype=np.float64)
+    values[values == -999.0] = np.nan
+    return dates, values
+
+def monthly_aggregate(dates, values, first_year, n_years, how="mean"):
+    # (n_years x 12) monthly means, or totals over complete months only, in one bincount pass.
+    slot = (dates // 10000 - first_year) * 12 + dates // 100 % 100 - 1
+    keep = np.isfinite(values) & (slot >= 0) & (slot < n_years * 12)
+    counts = np.bincount(slot[keep], minlength=n_years * 12)
+    totals = np.bincount(slot[keep], weights=values[keep], minlength=n_years * 12)
+    if how == "sum":
+        days = np.array([calendar.monthrange(first_year + y, m)[1] for y in range(n_years) for m in range(1, 13)])
+        monthly = np.where(counts == days, totals, np.nan)
+    else:
+        monthly = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+    return monthly.reshape(n_years, 12)
+
+def mean_over_years(monthly):
+    # Per-month mean of the years that have a value; NaN where none do.
+    finite = np.isfinite(monthly)
+    n = finite.sum(axis=0)
+    return np.where(n > 0, np.where(finite, monthly, 0).sum(axis=0) / np.maximum(n, 1), np.nan)
+
+def get_climate_calendar(lat, lon, year=None, years=CALENDAR_YEARS):
+    # Monthly T_avg, precipitation, humidity and pressure averaged over `years` calendar years
+    # ending with `year` (the last complete year by default), from one NASA POWER range request.
+    now = datetime.now()
+    year = now.year - 1 if year is None else year
+    if year > now.year:
+        return {"Error": "Calendar year is in the future. Please provide a year up to the current year."}
+    first_year = year - years + 1
+    range_start = f"{first_year}0101"
+    range_end = min(datetime(year, 12, 31), datetime.fromordinal(now.toordinal() - 1)).strftime("%Y%m%d")
+    print(f"Fetching NASA POWER data for {range_start} to {range_end}...")
+    parameters = call_provider("nasa_power", get_nasa_power_daily, lat, lon, range_start, range_end,
+                               CALENDAR_POWER_PARAMETERS) or {}
+    monthly = {}
+    for key, name, how in (("T_avg", "T2M", "mean"), ("AP", "PRECTOT", "sum"), ("H", "RH2M", "mean"),
+                           ("P", "PS", "mean")):
+        if parameters.get(name):
+            dates, values = daily_series_arrays(parameters[name])
+            monthly[key] = mean_over_years(monthly_aggregate(dates, values, first_year, years, how))
+        else:
+            monthly[key] = np.full(12, np.nan)
+    monthly["P"] = monthly["P"] * 10  # POWER reports station (surface) pressure in kPa
+    if np.isnan(monthly["AP"]).any():
+        print("NASA precipitation missing; asking Open-Meteo for the same range...")
+        trace_count("fallback.precipitation")
+        series = call_provider("open_meteo", get_open_meteo_daily_precipitation, lat, lon, range_start, range_end)
+        if series:
+            dates, values = daily_series_arrays(series)
+            fallback = mean_over_years(monthly_aggregate(dates, values, first_year, years, "sum"))
+            monthly["AP"] = np.where(np.isnan(monthly["AP"]), fallback, monthly["AP"])
+    if np.isnan(monthly["T_avg"]).all() and np.isnan(monthly["AP"]).all():
+        return {"Error": f"No climate data for {first_year}-{year}."}
+    return {"Date Range": f"{range_start} to {range_end}", **monthly}
+
+def sea_level_pressure(pressure, elevation, temperature):
+    # Reduces station pressure (hPa) to sea level with the barometric formula, so it compares
+    # with OpenWeather's "pressure" and the P_opt values; 15 C stands in for a missing temperature.
+    temperature = np.where(np.isnan(temperature), 15.0, temperature)
+    lapse = 0.0065 * elevation
+    return pressure * (1 - lapse / (temperature + lapse + 273.15)) ** -5.257
+
+def planting_calendar(lat, lon, folder_path=PLANT_DATABASE_FOLDER, year=None, years=CALENDAR_YEARS,
+                      k=RESULT_SHORTLIST_SIZE, deadline=LOCATION_REPORT_DEADLINE, scorer=None):
+    # Best crops for every month and their fitness across the year, from one climate range
+    # request and a single (12 months x crops) scoring pass instead of twelve location runs.
+    index = get_spatial_index()
+    soil, _ = index.estimate("soil", lat, lon)
+    elevation, _ = index.estimate("elevation", lat, lon)
+    calls = {"climate": (get_climate_calendar, lat, lon, year, years)}
+    if soil is None:
+        calls["soil"] = (get_soil_data_bulk, lat, lon)
+    if elevation is None:
+        calls["elevation"] = (get_terrain_data, lat, lon)
+    with trace_stage("location_fetch", calendar=True):
+        results = fetch_all(calls, deadline)
+    climate = results["climate"]
+    if not climate or "Error" in climate:
+        raise ValueError((climate or {}).get("Error", "Climate data request did not complete."))
+    if soil is None:
+        soil = results["soil"]["0-5cm"] if results["soil"] else get_soil_data(lat, lon)
+    if elevation is None and results.get("elevation"):
+        elevation = to_float((results["elevation"].get("results") or [{}])[0].get("elevation"))
+    humidity = climate["H"]
+    # Without an elevation the station pressure cannot be reduced, so those months use the
+    # sea-level reading below instead.
+    pressure = (np.full(12, np.nan) if elevation is None
+                else sea_level_pressure(climate["P"], elevation, climate["T_avg"]))
+    if np.isnan(humidity).any() or np.isnan(pressure).any():
+        # Months POWER could not cover fall back to the current reading, as the location flow does.
+        main = (get_weather_data(lat, lon) or {}).get("main", {})
+        current_humidity, current_pressure = to_float(main.get("humidity")), to_float(main.get("pressure"))
+        humidity = np.where(np.isnan(humidity), np.nan if current_humidity is None else current_humidity, humidity)
+        pressure = np.where(np.isnan(pressure), np.nan if current_pressure is None else current_pressure, pressure)
+    ph = to_float((soil or {}).get("phh2o"))
+    # The monthly mean stands in for the instantaneous temperature.
+    readings = np.column_stack([climate["T_avg"], humidity, pressure, climate["T_avg"], climate["AP"],
+                                np.full(12, np.nan if ph is None else ph)])
+    if scorer is None:
+        scorer = get_recommendation_model(folder_path).state["scorer"]
+    scores = scorer.score(readings)
+    top_index, top_score = top_k_rows(scores, k)
+    months = []
+    for m in range(12):
+        sensor = {key: None if np.isnan(value) else float(value) for key, value in zip(SENSOR_KEYS, readings[m])}
+        months.append({
+            "month": m + 1,
+            "name": calendar.month_name[m + 1],
+            "sensor": sensor,
+            "missing": [key for key, value in sensor.items() if value is None],
+            "top_crops": [{"crop": scorer.crops[i], "fitness": float(score)}
+                          for i, score in zip(top_index[m], top_score[m]) if i >= 0]
+        })
+    shortlisted = sorted({int(i) for i in top_index.ravel() if i >= 0})
+    curves = {scorer.crops[i]: [None if np.isnan(score) else float(score) for score in scores[:, i]]
+              for i in shortlisted}
+    return {"lat": lat, "lon": lon, "date_range": climate["Date Range"], "months": months, "curves": curves}
+
+def print_planting_calendar(result):
+    print(f"Planting calendar for ({result['lat']}, {result['lon']}), climate {result['date_range']}:")
+    for month in result["months"]:
+        sensor = month["sensor"]
+        climate = ", ".join(f"{key} {sensor[key]:.1f}" for key in ("T_avg", "AP", "H") if sensor[key] is not None)
+        if month["top_crops"]:
+            best = ", ".join(f"{entry['crop']} {entry['fitness']:.3f}" for entry in month["top_crops"])
+        else:
+            best = f"not scored, missing {', '.join(month['missing'])}"
+        print(f"  {month['name'][:3]}  {best}  ({climate})")
+
+# ----------------------- Recommendation Service -----------------------
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_RELOAD_INTERVAL = 5.0
+SERVICE_WORKERS = 16
+
+class RecommendationModel:
+    # The optimum table and its CropScorer, loaded once and kept warm. A reload builds the
+    # new state completely before swapping it in, so concurrent readers never see a mix.
+    def __init__(self, folder_path=PLANT_DATABASE_FOLDER, learned=LEARNED_SIGMAS, readonly=False):
+        self.folder_path = folder_path
+        self.learned = learned
+        self.reload_lock = threading.Lock()
+        self.known_files = known_csv_hashes(folder_path)
+        self.state = None
+        self.stop_event = threading.Event()
+        self.reload(readonly)
+    def reload(self, readonly=False):
+        # Cheap when nothing changed: unchanged files reuse their hash after one stat each.
+        with self.reload_lock:
+            digest, files = fingerprint_csv_files(self.folder_path, self.known_files)
+            self.known_files = {f["path"]: f for f in files}
+            if self.state is not None and self.state["digest"] == digest:
+                if readonly or not self.state["readonly"]:
+                    return False
+                # Loaded read-only (the GUI warm-up): the first writable call stores the
+                # caches and plant counts, and keeps the scorer that was already built.
+                load_optimal_conditions(self.folder_path)
+                self.state = {**self.state, "readonly": False}
+                return False
+            table = load_optimal_conditions(self.folder_path, readonly=readonly)
+            if table is None:
+                raise FileNotFoundError(f"No crop data found in {self.folder_path}")
+            scorer = CropScorer.from_optimal_conditions(table["optimal"], DEFAULT_SIGMAS, DEFAULT_WEIGHTS,
+                                                        self.learned)
+            self.state = {
+                "digest": digest,
+                "scorer": scorer,
+                "index": {crop: i for i, crop in enumerate(scorer.crops)},
+                "total_plants": table["total_plants"],
+                "loaded_at": time.time(),
+                "readonly": readonly
+            }
+            print(f"✅ Model loaded: {len(scorer.crops)} crops (fingerprint {digest[:12]})")
+            return True
+    def watch(self, interval=SERVICE_RELOAD_INTERVAL):
+        def loop():
+            while not self.stop_event.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"⚠️ Model reload failed, keeping the previous table: {e}")
+        threading.Thread(target=loop, name="model-reload", daemon=True).start()
+    def stop(self):
+        self.stop_event.set()
+    def status(self):
+        state = self.state
+        return {"crops": len(state["scorer"].crops), "total_plants": state["total_plants"],
+                "fingerprint": state["digest"], "loaded_at": state["loaded_at"]}
+    def top_k(self, sensor_data, k=RESULT_SHORTLIST_SIZE, min_score=None, crops=None):
+        state = self.state
+        scorer = state["scorer"]
+        scores = scorer.score(sensor_vector(sensor_data))
+        if not crops:
+            return [(scorer.crops[i], float(scores[i])) for i in top_k_indices(scores, k, min_score)]
+        ids = np.array([state["index"][crop] for crop in crops if crop in state["index"]], dtype=np.intp)
+        if not len(ids):
+            raise ValueError("No matching crop data found for the selected plants.")
+        return [(scorer.crops[ids[i]], float(scores[ids[i]])) for i in top_k_indices(scores[ids], k, min_score)]
+    def recommend(self, sensor_data, crops=None):
+        shortlist = self.top_k(sensor_data, 1, crops=crops)
+        if not shortlist:
+            raise ValueError("No crop could be scored for these sensor values.")
+        return shortlist[0]
+    def recommend_many(self, readings):
+        scorer = self.state["scorer"]
+        # reshape keeps an empty batch two-dimensional: (0, len(SENSOR_KEYS)), not (0,).
+        matrix = np.array([sensor_vector(reading) for reading in readings], dtype=np.float64)
+        best_index, best_score = scorer.best(matrix.reshape(len(readings), len(SENSOR_KEYS)))
+        return [(scorer.crops[i], float(score)) for i, score in zip(best_index, best_score)]
+
+_recommendation_models = {}
+_recommendation_models_lock = threading.Lock()
+
+def get_recommendation_model(folder_path, readonly=False):
+    # One warm model per folder for the GUI; callers on other threads share it. The first
+    # load happens under the lock so the warm-up and a selection never both build one.
+    with _recommendation_models_lock:
+        model = _recommendation_models.get(folder_path)
+        if model is None:
+            model = RecommendationModel(folder_path, readonly=readonly)
+            _recommendation_models[folder_path] = model
+            return model
+    model.reload(readonly)
+    return model
+
+def require_sensor_data(params):
+    sensor_data = params.get("sensor")
+    if not isinstance(sensor_data, dict):
+        raise ValueError("params.sensor must be an object with keys " + ", ".join(SENSOR_KEYS))
+    missing = [key for key in SENSOR_KEYS if sensor_data.get(key) is None]
+    if missing:
+        raise ValueError(f"Missing sensor values: {missing}")
+    return {key: float(sensor_data[key]) for key in SENSOR_KEYS}
+
+class RecommendationService:
+    # JSON-RPC 2.0 over the warm model; shared by the HTTP and stdin/stdout front ends.
+    def __init__(self, model):
+        self.model = model
+        self.methods = {
+            "recommend": self.recommend,
+            "top_k": self.top_k,
+            "recommend_many": self.recommend_many,
+            "location_report": self.location_report,
+            "calendar": self.calendar,
+            "status": lambda params: self.model.status()
+        }
+    def recommend(self, params):
+        crop, fitness = self.model.recommend(require_sensor_data(params), params.get("crops"))
+        return {"crop": crop, "fitness": fitness}
+    def top_k(self, params):
+        shortlist = self.model.top_k(require_sensor_data(params), int(params.get("k", RESULT_SHORTLIST_SIZE)),
+                                     params.get("min_score"), params.get("crops"))
+        return [{"crop": crop, "fitness": fitness} for crop, fitness in shortlist]
+    def recommend_many(self, params):
+        readings = [require_sensor_data({"sensor": reading}) for reading in params.get("readings", [])]
+        return [{"crop": crop, "fitness": fitness} for crop, fitness in self.model.recommend_many(readings)]
+    def location_report(self, params):
+        report = get_location_report(float(params["lat"]), float(params["lon"]), int(params["month"]),
+                                     int(params["year"]), params.get("deadline", LOCATION_REPORT_DEADLINE))
+        result = {"report": report.to_dict(), "sensor": report.to_sensor_data(),
+                  "missing": report.missing_sensor_keys()}
+        if not result["missing"]:
+            k = int(params.get("k", RESULT_SHORTLIST_SIZE))
+            result["top_crops"] = [{"crop": crop, "fitness": fitness}
+                                   for crop, fitness in self.model.top_k(result["sensor"], k)]
+        return result
+    def calendar(self, params):
+        year = params.get("year")
+        return planting_calendar(float(params["lat"]), float(params["lon"]), self.model.folder_path,
+                                 None if year is None else int(year), int(params.get("years", CALENDAR_YEARS)),
+                                 int(params.get("k", RESULT_SHORTLIST_SIZE)),
+                                 params.get("deadline", LOCATION_REPORT_DEADLINE), self.model.state["scorer"])
+    def handle(self, request):
+        request_id = request.get("id") if isinstance(request, dict) else None
+        # A notification (a valid call without an id) never gets a reply, not even an error.
+        notification = (isinstance(request, dict) and "id" not in request
+                        and isinstance(request.get("method"), str))
+        def error(code, message):
+            if notification:
+                return None
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return error(-32600, "Invalid request")
+        method = self.methods.get(request["method"])
+        if method is None:
+            return error(-32601, f"Method not found: {request['method']}")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return error(-32602, "params must be an object")
+        try:
+            result = method(params)
+        except (KeyError, TypeError, ValueError) as e:
+            return error(-32602, f"Invalid params: {e}")
+        except Exception as e:
+            return error(-32000, str(e))
+        if notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+    def handle_payload(self, payload):
+        # Returns the serialized response, or None when nothing should be sent back.
+        try:
+            request = json.loads(payload)
+        except ValueError:
+            return json.dumps({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}})
+        if isinstance(request, list):
+            if not request:
+                # An empty batch is itself an invalid request (JSON-RPC 2.0, section 6).
+                return json.dumps({"jsonrpc": "2.0", "id": None,
+                                   "error": {"code": -32600, "message": "Invalid request"}})
+            responses = [response for response in map(self.handle, request) if response is not None]
+            return json.dumps(responses) if responses else None
+        response = self.handle(request)
+        return None if response is None else json.dumps(response)
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive so clients can reuse one connection; without Nagle the separate header and
+    # body writes do not stall on delayed ACKs.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    def log_message(self, *args):
+        pass
+    def send_json(self, status, body):
+        data = body.encode() if body else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    def do_GET(self):
+        if urlsplit(self.path).path == "/health":
+            self.send_json(200, json.dumps({"status": "ok", **self.server.service.model.status()}))
+        else:
+            self.send_json(404, json.dumps({"error": "POST JSON-RPC requests to /rpc"}))
+    def do_POST(self):
+        if urlsplit(self.path).path != "/rpc":
+            self.send_json(404, json.dumps({"error": "POST JSON-RPC requests to /rpc"}))
+            return
+        payload = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        response = self.server.service.handle_payload(payload)
+        self.send_json(200 if response is not None else 204, response)
+
+class ServiceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    def __init__(self, service, host=SERVICE_HOST, port=SERVICE_PORT):
+        super().__init__((host, port), ServiceRequestHandler)
+        self.service = service
+
+def serve_stdio(service, workers=SERVICE_WORKERS, stdin=None, stdout=None):
+    # One JSON-RPC request per input line, answered concurrently; responses carry the request
+    # id and may come back out of order. Log output is moved to stderr to keep stdout clean.
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    write_lock = threading.Lock()
+    def answer(line):
+        response = service.handle_payload(line)
+        if response is not None:
+            with write_lock:
+                stdout.write(response + "\n")
+                stdout.flush()
+    with redirect_stdout(sys.stderr), ThreadPoolExecutor(max_workers=workers) as executor:
+        for line in stdin:
+            if line.strip():
+                executor.submit(answer, line)
+
+def serve(folder_path=PLANT_DATABASE_FOLDER, host=SERVICE_HOST, port=SERVICE_PORT, stdio=False,
+          reload_interval=SERVICE_RELOAD_INTERVAL):
+    with redirect_stdout(sys.stderr) if stdio else nullcontext():
+        model = RecommendationModel(folder_path)
+    model.watch(reload_interval)
+    service = RecommendationService(model)
+    try:
+        if stdio:
+            serve_stdio(service)
+            return
+        server = ServiceServer(service, host, port)
+        print(f"🌱 Serving JSON-RPC on http://{host}:{server.server_address[1]}/rpc (health at /health)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    finally:
+        model.stop()
+
+# ----------------------- Plant Name Search -----------------------
+
+SEARCH_GRAM_SIZE = 3
+SEARCH_RESULT_LIMIT = 200
+SEARCH_DEBOUNCE_MS = 80
+
+class PlantSearchIndex:
+    def __init__(self, names, gram_size=SEARCH_GRAM_SIZE):
+        self.names = sorted(names, key=str)
+        self.lowered = [str(name).lower() for name in self.names]
+        self.gram_size = gram_size
+        # Lowercase sort order for bisecting prefix ranges.
+        self.prefix_order = sorted(range(len(self.names)), key=self.lowered.__getitem__)
+        self.prefix_keys = [self.lowered[i] for i in self.prefix_order]
+        # Every 1..gram_size-gram maps to the ascending ids containing it, so short queries
+        # are a single lookup and longer ones intersect their gram lists before verifying.
+        postings = {}
+        for i, name in enumerate(self.lowered):
+            grams = {name[start:start + n] for n in range(1, gram_size + 1) for start in range(len(name) - n + 1)}
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self.all_ids = np.arange(len(self.names), dtype=np.int32)
+        self._last_query = None
+        self._last_matches = None
+    def __len__(self):
+        return len(self.names)
+    def prefix_matches(self, query):
+        lo = bisect.bisect_left(self.prefix_keys, query)
+        hi = bisect.bisect_left(self.prefix_keys, query + "\uffff", lo)
+        return self.prefix_order[lo:hi]
+    def substring_matches(self, query):
+        if not query:
+            return self.all_ids
+        if self._last_query is not None and self._last_query in query:
+            # The query only grew, so the answer is a subset of the previous one.
+            candidates = self._last_matches
+        elif len(query) <= self.gram_size:
+            candidates = self.postings.get(query, self.all_ids[:0])
+        else:
+            lists = sorted((self.postings.get(query[start:start + self.gram_size], self.all_ids[:0])
+                            for start in range(len(query) - self.gram_size + 1)), key=len)
+            candidates = lists[0]
+            for ids in lists[1:]:
+                if not len(candidates):
+                    break
+                candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        if len(query) > self.gram_size or candidates is self._last_matches:
+            candidates = np.array([i for i in candidates if query in self.lowered[i]], dtype=np.int32)
+        self._last_query, self._last_matches = query, candidates
+        return candidates
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        # Prefix matches first, then other substring matches, both alphabetical. Returns the
+        # names to show and the total number of matches, or None when a full prefix page
+        # made counting the rest unnecessary.
+        query = query.strip().lower()
+        if not query:
+            return self.names[:limit], len(self.names)
+        prefix_ids = self.prefix_matches(query)
+        if len(prefix_ids) >= limit:
+            return [self.names[i] for i in prefix_ids[:limit]], None
+        matches = self.substring_matches(query)
+        shown = [self.names[i] for i in prefix_ids]
+        for i in matches:
+            if len(shown) >= limit:
+                break
+            if not self.lowered[i].startswith(query):
+                shown.append(self.names[i])
+        return shown, len(matches)
+
+# ----------------------- Background Worker -----------------------
+
+class WorkerJob:
+    def __init__(self, worker, on_done, on_error, on_progress):
+        self.worker = worker
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+    def progress(self, message):
+        # Safe from any thread; delivered on the Tk thread by BackgroundWorker.poll.
+        self.worker.results.put((self, "progress", message))
+    def cancel(self):
+        self.cancel_event.set()
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+class BackgroundWorker:
+    def __init__(self, root, max_workers=2, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="worker")
+        self.results = queue.Queue()
+        self.root.after(self.poll_ms, self.poll)
+    def submit(self, func, *args, on_done=None, on_error=None, on_progress=None):
+        # func runs on a worker thread as func(job, *args); callbacks run on the Tk thread.
+        job = WorkerJob(self, on_done, on_error, on_progress)
+        self.executor.submit(self._run, job, func, args)
+        return job
+    def _run(self, job, func, args):
+        try:
+            self.results.put((job, "done", func(job, *args)))
+        except Exception as e:
+            self.results.put((job, "error", e))
+    def poll(self):
+        while True:
+            try:
+                job, kind, payload = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if job.cancelled():
+                continue
+            callback = {"progress": job.on_progress, "done": job.on_done, "error": job.on_error}[kind]
+            if callback is not None:
+                callback(payload)
+            elif kind == "error":
+                messagebox.showerror("Error", str(payload))
+        self.root.after(self.poll_ms, self.poll)
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
 # ----------------------- GUI Classes (Pages) -----------------------
 
@@ -400,10 +2931,20 @@ class LocationInputPage(tk.Frame):
         except ValueError:
             messagebox.showerror("Error", "Please enter numeric values for location.")
             return
-        report = get_location_info(lat, lon, month, year)
-        csv_path = '/Users/michael_z/Downloads/location_data_report.csv'
-        export_report_to_csv(report, csv_path)
-        report_from_csv = read_report_from_csv(csv_path)
+        self.controller.run_in_background(self.fetch_sensor_data, lat, lon, month, year,
+                                          on_done=self.on_sensor_data, status="Fetching location data...")
+    def fetch_sensor_data(self, job, lat, lon, month, year):
+        # Cancelling stops the fan-out: no further provider calls are started.
+        try:
+            report = get_location_report(lat, lon, month, year, progress=job.progress, cancel=job.cancel_event)
+        except FetchCancelled:
+            return None
+        if job.cancelled():
+            return None
+        export_report_async(report, REPORT_EXPORT_PATH)
+        return report.to_sensor_data()
+    def on_sensor_data(self, sensor_data):
+        # Missing values are asked for on the Tk thread, then scoring goes back to a worker.
         prompts = {
             'T': "Enter instantaneous temperature (°C): ",
             'H': "Enter ambient humidity (%): ",
@@ -420,7 +2961,6 @@ class LocationInputPage(tk.Frame):
             'AP': (0, 1000),
             'pH': (0, 14)
         }
-        sensor_data = get_sensor_data_from_report(report_from_csv)
         sensor_data = prompt_for_missing_data(sensor_data, prompts, valid_ranges)
         self.controller.process_recommendation(sensor_data)
 
@@ -471,17 +3011,21 @@ class ResultPage(tk.Frame):
         self.lbl_recommendation = tk.Label(self, text="", font=("Helvetica", 14, "bold"), fg="green")
         self.lbl_recommendation.pack(pady=5)
         btn_image = tk.Button(self, text="What does it look like?",
-                              command=lambda: look_at_image(self.controller.optimal_crop))
+                              command=lambda: look_at_image(self.controller.optimal_crop, self.controller.worker))
         btn_image.pack(pady=5)
         back_btn = tk.Button(self, text="Back",
                              command=lambda: controller.show_frame("ModeSelectionPage"))
         back_btn.pack(pady=5)
         exit_btn = tk.Button(self, text="Exit", command=controller.destroy)
         exit_btn.pack(pady=5)
-    def set_result(self, crop, fitness):
+    def set_result(self, crop, fitness, shortlist=None):
         self.text_result.delete(1.0, tk.END)
         self.text_result.insert(tk.END, "Optimal Crop Recommendation:\n")
         self.text_result.insert(tk.END, f"{crop} (Fitness Score: {fitness:.4f})\n")
+        if shortlist and len(shortlist) > 1:
+            self.text_result.insert(tk.END, "\nTop Candidates:\n")
+            for rank, (candidate, score) in enumerate(shortlist, start=1):
+                self.text_result.insert(tk.END, f"{rank}. {candidate} (Fitness Score: {score:.4f})\n")
         self.lbl_recommendation.config(text=f"Recommended Crop: {crop} (Score: {fitness:.4f})")
 
 # ----------------------- Main Application Class -----------------------
@@ -499,16 +3043,82 @@ class App(tk.Tk):
         container.pack(side="top", fill="both", expand=True)
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
+        self.worker = BackgroundWorker(self)
+        self.current_job = None
+        status_bar = tk.Frame(self)
+        status_bar.pack(side="bottom", fill="x")
+        self.status_var = tk.StringVar(value="")
+        tk.Label(status_bar, textvariable=self.status_var, anchor="w").pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        self.cancel_btn = tk.Button(status_bar, text="Cancel", command=self.cancel_background, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.RIGHT, padx=5, pady=2)
+        # Pages are built the first time they are shown; only the first one exists at startup.
+        self.container = container
+        self.page_classes = {F.__name__: F for F in (OutdoorsPage, ModeSelectionPage, LocationInputPage,
+                                                     ManualInputPage, ResultPage)}
         self.frames = {}
-        for F in (OutdoorsPage, ModeSelectionPage, LocationInputPage, ManualInputPage, ResultPage):
-            page_name = F.__name__
-            frame = F(parent=container, controller=self)
-            self.frames[page_name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self.search_index = None
         self.show_frame("OutdoorsPage")
+        self.bind("<Map>", self.on_first_map)
+    def get_frame(self, page_name):
+        frame = self.frames.get(page_name)
+        if frame is None:
+            frame = self.page_classes[page_name](parent=self.container, controller=self)
+            frame.grid(row=0, column=0, sticky="nsew")
+            self.frames[page_name] = frame
+        return frame
     def show_frame(self, page_name):
-        frame = self.frames[page_name]
-        frame.tkraise()
+        with trace_stage("ui_render", page=page_name):
+            frame = self.get_frame(page_name)
+            frame.tkraise()
+            frame.update_idletasks()
+    def on_first_map(self, event):
+        # Once the window is on screen, load pandas/numpy and the plant table off the Tk thread
+        # so the first recommendation or plant picker does not wait for them.
+        # The warm-up only reads: it is skipped when the folder is missing and writes no caches.
+        if event.widget is not self:
+            return
+        self.unbind("<Map>")
+        if not os.path.isdir(PLANT_DATABASE_FOLDER):
+            return
+        self.after_idle(lambda: self.worker.submit(self.plant_search_index, True,
+                                                   on_error=lambda e: print(f"⚠️ Plant table warm-up failed: {e}")))
+    def plant_search_index(self, job, readonly=False):
+        # Runs on a worker: shares the warm model and rebuilds the index only when the table changed.
+        model = get_recommendation_model(PLANT_DATABASE_FOLDER, readonly)
+        state = model.state
+        cached = self.search_index
+        if cached is None or cached[0] != state["digest"]:
+            cached = (state["digest"], PlantSearchIndex(state["scorer"].crops))
+            self.search_index = cached
+        return cached[1]
+    def run_in_background(self, func, *args, on_done=None, status="Working..."):
+        # One foreground job at a time: starting a new one cancels the previous job.
+        if self.current_job is not None:
+            self.current_job.cancel()
+        def finish(result):
+            self.set_busy(None)
+            if result is not None and on_done is not None:
+                on_done(result)
+        def fail(error):
+            self.set_busy(None)
+            messagebox.showerror("Error", str(error))
+        self.current_job = self.worker.submit(func, *args, on_done=finish, on_error=fail,
+                                              on_progress=self.status_var.set)
+        self.set_busy(status)
+        return self.current_job
+    def set_busy(self, status):
+        if status is None:
+            self.current_job = None
+        self.status_var.set(status or "")
+        self.cancel_btn.config(state=tk.NORMAL if status else tk.DISABLED)
+    def cancel_background(self):
+        if self.current_job is not None:
+            self.current_job.cancel()
+        self.set_busy(None)
+        self.status_var.set("Cancelled.")
+    def destroy(self):
+        self.worker.shutdown()
+        tk.Tk.destroy(self)
     def open_selective_window(self):
         sel_win = tk.Toplevel(self)
         sel_win.title("Select Plants")
@@ -532,22 +3142,38 @@ class App(tk.Tk):
         sel_scroll = tk.Scrollbar(sel_frame, orient=tk.VERTICAL, command=sel_listbox.yview)
         sel_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         sel_listbox.config(yscrollcommand=sel_scroll.set)
-        folder_path = '/Users/michael_z/Downloads/Plant Database'
-        df = load_local_crop_datasets(folder_path)
-        if df is None:
-            messagebox.showerror("Error", "No crop data found for selection.")
-            sel_win.destroy()
-            return
-        group_col = next((col for col in ['label', 'crop', 'common_name', 'plant_name'] if col in df.columns), None)
-        all_plants = sorted(df[group_col].unique())
-        def update_avail_list(*args):
-            search_text = search_var.get().lower()
+        avail_status = tk.Label(avail_frame, text="Loading plants...", anchor="w")
+        avail_status.pack(fill=tk.X)
+        search_state = {"index": None, "pending": None}
+        def update_avail_list():
+            search_state["pending"] = None
+            index = search_state["index"]
+            if index is None or not sel_win.winfo_exists():
+                return
+            # Only a capped window of matches is ever inserted into the Listbox.
+            shown, total = index.search(search_var.get())
             avail_listbox.delete(0, tk.END)
-            for plant in all_plants:
-                if search_text in str(plant).lower():
-                    avail_listbox.insert(tk.END, plant)
-        search_var.trace("w", update_avail_list)
-        update_avail_list()
+            avail_listbox.insert(tk.END, *shown)
+            if total is None or total > len(shown):
+                avail_status.config(text=f"Showing first {len(shown)} matches; keep typing to narrow")
+            else:
+                avail_status.config(text=f"{total} of {len(index)} plants")
+        def schedule_update(*args):
+            # Debounced so a burst of keystrokes triggers one search.
+            if search_state["pending"] is not None:
+                sel_win.after_cancel(search_state["pending"])
+            search_state["pending"] = sel_win.after(SEARCH_DEBOUNCE_MS, update_avail_list)
+        search_var.trace("w", schedule_update)
+        def on_table(index):
+            if not sel_win.winfo_exists():
+                return
+            search_state["index"] = index
+            update_avail_list()
+        def on_table_error(error):
+            messagebox.showerror("Error", str(error))
+            if sel_win.winfo_exists():
+                sel_win.destroy()
+        self.worker.submit(self.plant_search_index, on_done=on_table, on_error=on_table_error)
         def add_selected():
             indices = avail_listbox.curselection()
             for idx in indices:
@@ -572,43 +3198,99 @@ class App(tk.Tk):
         btn_back_sel = tk.Button(sel_win, text="Back", command=sel_win.destroy)
         btn_back_sel.pack(pady=5)
     def process_recommendation(self, sensor_data):
-        folder_path = '/Users/michael_z/Downloads/Plant Database'
-        df = load_local_crop_datasets(folder_path)
-        if df is None:
-            messagebox.showerror("Error", "No crop data found.")
+        selected = self.selected_plants if self.solution_mode == "selective" else None
+        self.run_in_background(self.score_crops, sensor_data, selected,
+                               on_done=self.show_recommendation, status="Scoring crops...")
+    def score_crops(self, job, sensor_data, selected_plants):
+        job.progress("Loading plant database...")
+        # Warm across recommendations; only reloaded when the CSV folder changes.
+        model = get_recommendation_model(PLANT_DATABASE_FOLDER)
+        if job.cancelled():
+            return None
+        job.progress(f"Scoring {len(selected_plants) if selected_plants else model.status()['crops']} crops...")
+        return model.top_k(sensor_data, RESULT_SHORTLIST_SIZE, crops=selected_plants or None)
+    def show_recommendation(self, shortlist):
+        if not shortlist:
+            # top_k drops NaN scores, so this is empty when no crop could be scored.
+            messagebox.showerror("Error", "No crop could be scored for these sensor values.")
             return
-        export_plant_counts(df, folder_path)
-        if self.solution_mode == "selective" and self.selected_plants:
-            group_col = next((col for col in ['label', 'crop', 'common_name', 'plant_name'] if col in df.columns), None)
-            df = df[df[group_col].isin(self.selected_plants)]
-            if df.empty:
-                messagebox.showerror("Error", "No matching crop data found for the selected plants.")
-                return
-        optimal_conditions = compute_optimal_conditions(df)
-        sigmas = {
-            'sigma_T': 2.0,
-            'sigma_H': 10.0,
-            'sigma_P': 10.0,
-            'sigma_Tavg': 2.0,
-            'sigma_AP': 20.0,
-            'sigma_pH': 0.5
-        }
-        weights = {
-            'w_T': 0.35,
-            'w_H': 0.30,
-            'w_P': 0.05,
-            'w_Tavg': 0.15,
-            'w_AP': 0.10,
-            'w_pH': 0.05
-        }
-        best_crop, best_fitness, _ = recommend_crop(sensor_data, optimal_conditions, sigmas, weights)
+        best_crop, best_fitness = shortlist[0]
         self.optimal_crop = best_crop
-        result_page = self.frames["ResultPage"]
-        result_page.set_result(best_crop, best_fitness)
+        result_page = self.get_frame("ResultPage")
+        with trace_stage("ui_render", page="ResultPage.set_result"):
+            result_page.set_result(best_crop, best_fitness, shortlist)
         self.show_frame("ResultPage")
+        if IMAGE_PREFETCH_TOP_K:
+            # Warm the image cache so "What does it look like?" opens instantly; failures stay quiet.
+            crops = [crop for crop, _ in shortlist[:IMAGE_PREFETCH_TOP_K]]
+            self.worker.submit(prefetch_crop_images, crops, on_error=lambda e: None)
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crop Recommendation System")
+    parser.add_argument("--trace", metavar="PATH", help="Append per-stage timings and counters as JSON lines")
+    parser.add_argument("--profile", metavar="DIR", help="Capture cProfile and tracemalloc output into DIR")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("gui", help="Launch the Tk application (default)")
+    calendar_cmd = commands.add_parser("calendar", help="Best crops for every month of a year at one location")
+    calendar_cmd.add_argument("--lat", type=float, required=True)
+    calendar_cmd.add_argument("--lon", type=float, required=True)
+    calendar_cmd.add_argument("--year", type=int, help="Last climate year (default: last complete year)")
+    calendar_cmd.add_argument("--years", type=int, default=CALENDAR_YEARS, help="Years of climate to average")
+    calendar_cmd.add_argument("--database", default=PLANT_DATABASE_FOLDER)
+    calendar_cmd.add_argument("--top-k", type=int, default=RESULT_SHORTLIST_SIZE)
+    calendar_cmd.add_argument("--output", help="Also write the calendar as JSON")
+    serve_cmd = commands.add_parser("serve", help="Answer recommend/top_k/location_report requests as JSON-RPC")
+    serve_cmd.add_argument("--database", default=PLANT_DATABASE_FOLDER)
+    serve_cmd.add_argument("--host", default=SERVICE_HOST)
+    serve_cmd.add_argument("--port", type=int, default=SERVICE_PORT)
+    serve_cmd.add_argument("--stdio", action="store_true", help="Read requests from stdin, one per line")
+    serve_cmd.add_argument("--reload-interval", type=float, default=SERVICE_RELOAD_INTERVAL)
+    compile_db = commands.add_parser("compile-db", help="Precompute the optimum table for the plant database folder")
+    compile_db.add_argument("--database", default=PLANT_DATABASE_FOLDER)
+    batch = commands.add_parser("batch", help="Score a CSV/Parquet file of (lat, lon, month, year) points")
+    batch.add_argument("input")
+    batch.add_argument("output")
+    batch.add_argument("--database", default=PLANT_DATABASE_FOLDER)
+    batch.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    batch.add_argument("--retries", type=int, default=BATCH_RETRIES)
+    batch.add_argument("--top-k", type=int, default=RESULT_SHORTLIST_SIZE)
+    score = commands.add_parser("score-readings", help="Score a CSV/Parquet file of sensor readings on all cores")
+    score.add_argument("input")
+    score.add_argument("output")
+    score.add_argument("--database", default=PLANT_DATABASE_FOLDER)
+    score.add_argument("--workers", type=int, default=PARALLEL_WORKERS)
+    score.add_argument("--top-k", type=int, default=RESULT_SHORTLIST_SIZE)
+    args = parser.parse_args(argv)
     warnings.filterwarnings("ignore", category=FutureWarning, module="meteostat.core.loader")
+    import certifi  # local import
     os.environ['SSL_CERT_FILE'] = certifi.where()
-    app = App()
-    app.mainloop()
\ No newline at end of file
+    if args.trace:
+        enable_tracing(args.trace)
+    try:
+        with profile_capture(args.profile) if args.profile else nullcontext():
+            run_command(args)
+    finally:
+        tracer = disable_tracing()
+        if tracer is not None:
+            tracer.report()
+
+def run_command(args):
+    if args.command == "calendar":
+        result = planting_calendar(args.lat, args.lon, args.database, args.year, args.years, args.top_k)
+        print_planting_calendar(result)
+        if args.output:
+            write_json_file(args.output, result)
+    elif args.command == "serve":
+        serve(args.database, args.host, args.port, args.stdio, args.reload_interval)
+    elif args.command == "score-readings":
+        score_readings_file(args.input, args.output, args.database, args.workers, args.top_k)
+    elif args.command == "compile-db":
+        compile_plant_database(args.database)
+    elif args.command == "batch":
+        run_batch(args.input, args.output, args.database, args.workers, args.retries, args.top_k)
+    else:
+        app = App()
+        app.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The app is a single script shipped inside the Xcode asset catalog; put its directory on
+# sys.path so the benchmarks (and spawned measurement processes) can import it as Full_test.
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "Gardener", "Assets.xcassets", "Full_test.dataset")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
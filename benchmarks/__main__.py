@@ -0,0 +1,74 @@
+import argparse
+import sys
+from contextlib import nullcontext
+
+import Full_test as app
+from benchmarks import suite
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Crop Recommendation System benchmarks")
+    parser.add_argument("--trace", metavar="PATH", help="Append per-stage timings and counters as JSON lines")
+    parser.add_argument("--profile", metavar="DIR", help="Capture cProfile and tracemalloc output into DIR")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("scoring", help="Compare scalar and vectorized crop scoring")
+    parallel = commands.add_parser("parallel", help="Measure batch scoring speedup per worker count")
+    parallel.add_argument("--crops", type=int, default=10000)
+    parallel.add_argument("--readings", type=int, default=200_000)
+    parallel.add_argument("--workers", type=int, nargs="+")
+    parallel.add_argument("--top-k", type=int, default=5)
+    database = commands.add_parser("database", help="Compare CSV parsing with the compiled database")
+    database.add_argument("--rows", type=int, default=10_000_000)
+    search = commands.add_parser("search", help="Time plant-name search per keystroke")
+    search.add_argument("--names", type=int, default=100_000)
+    streaming = commands.add_parser("streaming", help="Check streaming aggregation RSS as input grows")
+    streaming.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 100_000_000])
+    streaming.add_argument("--chunk-rows", type=int, default=app.STREAM_CHUNK_ROWS)
+    startup = commands.add_parser("startup", help="Break down import time and time to first window")
+    startup.add_argument("--runs", type=int, default=5)
+    spatial = commands.add_parser("spatial", help="Count provider requests for a dense field with reuse")
+    spatial.add_argument("--points", type=int, default=500)
+    spatial.add_argument("--spread-km", type=float, default=3.0)
+    spatial.add_argument("--latency-ms", type=float, default=50.0)
+    pipeline = commands.add_parser("suite", help="Run the pipeline benchmarks against a stub API server")
+    pipeline.add_argument("--scale", choices=sorted(suite.BENCHMARK_SCALES), default="quick")
+    pipeline.add_argument("--latency-ms", type=float, default=50.0)
+    pipeline.add_argument("--failure-rate", type=float, default=0.0)
+    pipeline.add_argument("--results", default=suite.BENCHMARK_RESULTS_PATH)
+    pipeline.add_argument("--check", action="store_true", help="Exit with status 1 when a regression is found")
+    args = parser.parse_args(argv)
+    if args.trace:
+        app.enable_tracing(args.trace)
+    try:
+        with app.profile_capture(args.profile) if args.profile else nullcontext():
+            run_command(args)
+    finally:
+        tracer = app.disable_tracing()
+        if tracer is not None:
+            tracer.report()
+
+def run_command(args):
+    if args.command == "scoring":
+        suite.benchmark_scoring()
+    elif args.command == "parallel":
+        result = suite.benchmark_parallel_scoring(args.crops, args.readings, args.workers, args.top_k)
+        if not result["deterministic"]:
+            sys.exit(1)
+    elif args.command == "database":
+        suite.benchmark_plant_database(args.rows)
+    elif args.command == "search":
+        suite.benchmark_search(args.names)
+    elif args.command == "streaming":
+        result = suite.benchmark_streaming(args.rows, chunk_rows=args.chunk_rows)
+        if not result["bounded"]:
+            sys.exit(1)
+    elif args.command == "startup":
+        suite.benchmark_startup(args.runs)
+    elif args.command == "spatial":
+        suite.benchmark_spatial_reuse(args.points, args.spread_km, args.latency_ms / 1000)
+    elif args.command == "suite":
+        _, regressions = suite.benchmark_suite(args.scale, args.latency_ms / 1000, args.failure_rate, args.results)
+        if regressions and args.check:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+import Full_test as app
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    # Deterministic payloads in the same shapes the real providers return.
+    disable_nagle_algorithm = True
+    def log_message(self, *args):
+        pass
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        delay, fail = self.server.draw()
+        time.sleep(delay)
+        route = self.server.routes.get(parts.path)
+        if fail or route is None:
+            self.send_response(503 if fail else 404)
+            self.end_headers()
+            return
+        body = json.dumps(route(self, query)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def nasa_power(self, query):
+        start = datetime.strptime(query["start"][0], "%Y%m%d").toordinal()
+        end = datetime.strptime(query["end"][0], "%Y%m%d").toordinal()
+        days = [datetime.fromordinal(day).strftime("%Y%m%d") for day in range(start, end + 1)]
+        lat = float(query["latitude"][0])
+        # Station values at the stub's elevation: temperature falls 6.5 C per km and pressure
+        # (kPa) follows the standard atmosphere.
+        elevation = self.server.elevation(lat)
+        station_pressure = round(101.325 * (1 - 2.25577e-5 * elevation) ** 5.25588, 2)
+        series = {
+            "T2M": lambda day: round(25 - abs(lat) / 3 + int(day[4:6]) % 6 - 0.0065 * elevation, 2),
+            "PRECTOT": lambda day: round(1 + (int(day[6:]) % 5) * 0.7, 2),
+            "RH2M": lambda day: 55 + int(day[4:6]) * 2,
+            "PS": lambda day: station_pressure
+        }
+        requested = query.get("parameters", ["T2M,PRECTOT"])[0].split(",")
+        return {"properties": {"parameter": {name: {day: series[name](day) for day in days}
+                                             for name in requested if name in series}}}
+    def open_meteo(self, query):
+        start = datetime.strptime(query["start_date"][0], "%Y-%m-%d").toordinal()
+        end = datetime.strptime(query["end_date"][0], "%Y-%m-%d").toordinal()
+        return {"daily": {"precipitation_sum": [round(1 + (day % 5) * 0.7, 2) for day in range(start, end + 1)]}}
+    def openweather(self, query):
+        lat = float(query["lat"][0])
+        return {"name": "Stubville", "main": {"temp": round(25 - abs(lat) / 3, 2), "humidity": 60, "pressure": 1012}}
+    def soilgrids(self, query):
+        properties, depths = query["property"], query.get("depth", ["0-5cm"])
+        values = {prop: 60 + i for i, prop in enumerate(app.SOIL_PROPERTIES)}
+        if len(properties) == 1:
+            return {"features": [{"properties": {properties[0]: {depth: {"mean": values.get(properties[0])}
+                                                                 for depth in depths}}}]}
+        return {"type": "Feature", "properties": {"layers": [
+            {"name": prop, "depths": [{"label": depth, "values": {"mean": values.get(prop)}} for depth in depths]}
+            for prop in properties]}}
+    def opentopodata(self, query):
+        locations = query["locations"][0].split("|")
+        return {"results": [{"elevation": self.server.elevation(float(loc.split(",")[0])), "location": loc}
+                            for loc in locations]}
+
+class StubProviderServer(ThreadingHTTPServer):
+    # Local stand-in for NASA POWER, Open-Meteo, OpenWeather, SoilGrids and opentopodata.
+    # Each request sleeps latency +/- jitter seconds and fails with HTTP 503 at failure_rate.
+    # Terrain is 10 m per degree of latitude unless a fixed elevation (metres) is given.
+    daemon_threads = True
+    def __init__(self, latency=0.05, jitter=0.02, failure_rate=0.0, seed=0, elevation=None):
+        super().__init__(("127.0.0.1", 0), StubProviderHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.fixed_elevation = elevation
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.requests = 0
+        self.routes = {
+            "/power": StubProviderHandler.nasa_power,
+            "/open-meteo": StubProviderHandler.open_meteo,
+            "/openweather": StubProviderHandler.openweather,
+            "/soilgrids": StubProviderHandler.soilgrids,
+            "/opentopodata": StubProviderHandler.opentopodata
+        }
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+    def elevation(self, lat):
+        return round(abs(lat) * 10, 1) if self.fixed_elevation is None else self.fixed_elevation
+    def draw(self):
+        with self.rng_lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            return delay, self.rng.random() < self.failure_rate
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="stub-server", daemon=True).start()
+        return self
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+STUB_ENDPOINTS = {
+    "NASA_POWER_URL": "/power",
+    "OPEN_METEO_ARCHIVE_URL": "/open-meteo",
+    "OPENWEATHER_URL": "/openweather",
+    "SOILGRIDS_URL": "/soilgrids",
+    "OPENTOPODATA_URL": "/opentopodata"
+}
+
+@contextmanager
+def stub_providers(server):
+    # Points every app endpoint at the stub with cold memory-only caches and fresh breakers.
+    saved = {name: getattr(app, name) for name in STUB_ENDPOINTS}
+    for name, path in STUB_ENDPOINTS.items():
+        setattr(app, name, f"{server.base_url}{path}")
+    app.set_response_cache(app.ResponseCache(path=None))
+    app.set_spatial_index(app.SpatialIndex(path=None))
+    app._circuit_breakers.clear()
+    try:
+        yield server
+    finally:
+        for name, url in saved.items():
+            setattr(app, name, url)
+        app.set_response_cache(None)
+        app.set_spatial_index(None)
+        app._circuit_breakers.clear()
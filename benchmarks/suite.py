@@ -0,0 +1,565 @@
+import os
+import sys
+import time
+import json
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from math import radians, cos
+
+import numpy as np
+import pandas as pd
+
+import Full_test as app
+from benchmarks.stub_server import StubProviderServer, stub_providers
+
+def synthetic_optimal_conditions(n_crops, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        f"crop_{i}": {
+            'T_opt': float(rng.uniform(5, 35)),
+            'H_opt': float(rng.uniform(20, 95)),
+            'pH_opt': float(rng.uniform(4.5, 8.5)),
+            'AP_opt': float(rng.uniform(20, 300)),
+            'P_opt': float(rng.uniform(990, 1030)),
+            'sigma_T': float(rng.uniform(1, 5)),
+            'sigma_H': float(rng.uniform(5, 20)),
+            'sigma_P': float(rng.uniform(5, 15)),
+            'sigma_AP': float(rng.uniform(10, 60)),
+            'sigma_pH': float(rng.uniform(0.2, 1.0))
+        }
+        for i in range(n_crops)
+    }
+
+def synthetic_sensor_readings(n_readings, seed=1):
+    rng = np.random.default_rng(seed)
+    low = np.array([-5, 10, 950, -5, 0, 4], dtype=np.float64)
+    high = np.array([40, 100, 1050, 40, 400, 9], dtype=np.float64)
+    return rng.uniform(low, high, size=(n_readings, len(app.SENSOR_KEYS)))
+
+def benchmark_scoring(n_crops=10000, n_readings=100000, scalar_readings=20, seed=0):
+    optimal_conditions = synthetic_optimal_conditions(n_crops, seed)
+    readings = synthetic_sensor_readings(n_readings, seed + 1)
+    scorer = app.CropScorer.from_optimal_conditions(optimal_conditions, app.DEFAULT_SIGMAS, app.DEFAULT_WEIGHTS)
+    # The scalar path is far too slow for the full grid, so time a sample and extrapolate.
+    sample = readings[:scalar_readings]
+    start = time.perf_counter()
+    scalar_scores = [
+        [app.plant_fitness(dict(zip(app.SENSOR_KEYS, row)), optimal, app.DEFAULT_SIGMAS, app.DEFAULT_WEIGHTS)
+         for optimal in optimal_conditions.values()]
+        for row in sample
+    ]
+    scalar_elapsed = time.perf_counter() - start
+    max_abs_diff = float(np.max(np.abs(scorer.score(sample) - np.array(scalar_scores))))
+    start = time.perf_counter()
+    scorer.best(readings)
+    vector_elapsed = time.perf_counter() - start
+    learned_scorer = app.CropScorer.from_optimal_conditions(optimal_conditions, app.DEFAULT_SIGMAS, app.DEFAULT_WEIGHTS,
+                                                        learned=True)
+    start = time.perf_counter()
+    learned_scorer.best(readings)
+    learned_elapsed = time.perf_counter() - start
+    scalar_estimate = scalar_elapsed / len(sample) * n_readings
+    results = {
+        "n_crops": n_crops,
+        "n_readings": n_readings,
+        "scalar_seconds_estimated": scalar_estimate,
+        "vector_seconds": vector_elapsed,
+        "learned_vector_seconds": learned_elapsed,
+        "speedup": scalar_estimate / vector_elapsed if vector_elapsed else float('inf'),
+        "max_abs_diff": max_abs_diff
+    }
+    print(f"Scoring {n_crops} crops x {n_readings} readings:")
+    print(f"  scalar plant_fitness: {scalar_estimate:.1f}s (estimated from {len(sample)} readings)")
+    print(f"  vectorized CropScorer: {vector_elapsed:.2f}s ({results['speedup']:.0f}x faster)")
+    print(f"  vectorized CropScorer, per-crop sigmas: {learned_elapsed:.2f}s")
+    print(f"  max |scalar - vectorized| = {max_abs_diff:.3e}")
+    return results
+
+def benchmark_parallel_scoring(n_crops=10000, n_readings=200_000, worker_counts=None, k=5, seed=0):
+    cores = os.cpu_count() or 1
+    if worker_counts is None:
+        worker_counts = sorted({2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores} | {cores})
+    optimal_conditions = synthetic_optimal_conditions(n_crops, seed)
+    readings = synthetic_sensor_readings(n_readings, seed + 1)
+    runs = []
+    reference = None
+    for workers in worker_counts:
+        with app.ParallelScorer.from_optimal_conditions(optimal_conditions, app.DEFAULT_SIGMAS, app.DEFAULT_WEIGHTS,
+                                                    workers=workers) as scorer:
+            start = time.perf_counter()
+            scorer.start()
+            startup = time.perf_counter() - start
+            start = time.perf_counter()
+            result = scorer.rank(readings, k)
+            elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = result
+        run = {"workers": workers, "seconds": elapsed, "startup_seconds": startup,
+               "readings_per_sec": n_readings / elapsed if elapsed else float('inf'),
+               "identical": all(np.array_equal(a, b, equal_nan=True) for a, b in zip(result, reference))}
+        run["speedup"] = runs[0]["seconds"] / elapsed if runs else 1.0
+        run["efficiency"] = run["speedup"] * (runs[0]["workers"] if runs else workers) / workers
+        runs.append(run)
+    print(f"Parallel scoring, {n_crops} crops x {n_readings} readings, top-{k}, {cores} cores:")
+    for run in runs:
+        print(f"  {run['workers']:>3} workers: {run['seconds']:.2f}s ({run['readings_per_sec']:,.0f} readings/sec), "
+              f"speedup {run['speedup']:.2f}x, efficiency {run['efficiency']:.0%}, "
+              f"start-up {run['startup_seconds']:.2f}s{'' if run['identical'] else ', RESULTS DIFFER'}")
+    # Near-linear: at least 80% efficiency at the largest worker count that has its own core.
+    scaled = [run for run in runs if run["workers"] <= cores]
+    linear = not scaled or scaled[-1]["efficiency"] >= 0.8
+    deterministic = all(run["identical"] for run in runs)
+    print(f"{'✅' if linear else '⚠️'} {scaled[-1]['workers'] if scaled else 0} workers reached "
+          f"{scaled[-1]['efficiency'] if scaled else 0:.0%} efficiency; results "
+          f"{'identical' if deterministic else 'differ'} across worker counts")
+    return {"cores": cores, "runs": runs, "linear": linear, "deterministic": deterministic}
+
+def write_synthetic_plant_database(folder_path, n_rows, n_crops=1000, n_files=10, seed=0,
+                                   chunk_rows=1_000_000):
+    # Written in chunks so generating a large synthetic database never holds it all in memory.
+    rng = np.random.default_rng(seed)
+    os.makedirs(folder_path, exist_ok=True)
+    crop_optima = synthetic_optimal_conditions(n_crops, seed)
+    names = np.array(list(crop_optima))
+    centers = np.array([[o['T_opt'], o['H_opt'], o['pH_opt'], o['AP_opt']] for o in crop_optima.values()])
+    spreads = np.array([[o['sigma_T'], o['sigma_H'], o['sigma_pH'], o['sigma_AP']] for o in crop_optima.values()])
+    rows_per_file = [n_rows // n_files + (1 if i < n_rows % n_files else 0) for i in range(n_files)]
+    for i, file_rows in enumerate(rows_per_file):
+        path = os.path.join(folder_path, f"synthetic_{i:03d}.csv")
+        header = True
+        for start in range(0, file_rows, chunk_rows):
+            size = min(chunk_rows, file_rows - start)
+            codes = rng.integers(0, n_crops, size)
+            values = rng.normal(centers[codes], spreads[codes])
+            pd.DataFrame({
+                'label': names[codes],
+                'Temperature': values[:, 0].round(3),
+                'Humidity': values[:, 1].round(3),
+                'pH': values[:, 2].round(3),
+                'Rainfall': values[:, 3].round(3)
+            }).to_csv(path, mode='w' if header else 'a', header=header, index=False)
+            header = False
+    return folder_path
+
+def peak_rss_mb():
+    # Linux carries ru_maxrss across exec, so a spawned child would report its parent's peak;
+    # VmHWM belongs to the child's own address space.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    import resource  # local import: POSIX only
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+def _measure_plant_database_load(mode, path, results):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "csv":
+        df = app.load_local_crop_datasets(path)
+        loaded = time.perf_counter() - start
+        app.compute_optimal_conditions(df)
+    else:
+        # The app's startup path: fingerprint check plus the precomputed optimum table.
+        app.load_optimal_conditions(path)
+        loaded = time.perf_counter() - start
+    results.put({"load_seconds": loaded, "total_seconds": time.perf_counter() - start,
+                 "peak_rss_mb": peak_rss_mb(), "baseline_rss_mb": baseline})
+
+def _measure_plant_database_compile(folder_path, results):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    artifact = app.compile_plant_database(folder_path)
+    results.put({"artifact": artifact, "seconds": time.perf_counter() - start,
+                 "peak_rss_mb": peak_rss_mb(), "baseline_rss_mb": baseline})
+
+def measure_in_subprocess(target, *args):
+    # A fresh interpreter per measurement so peak RSS is not inherited from earlier runs.
+    import multiprocessing  # local import
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=target, args=(*args, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+def benchmark_plant_database(n_rows=10_000_000, n_crops=10000, n_files=10, seed=0):
+    folder_path = tempfile.mkdtemp(prefix="plant_db_bench_")
+    try:
+        print(f"Writing synthetic database: {n_rows} rows, {n_crops} crops, {n_files} files...")
+        write_synthetic_plant_database(folder_path, n_rows, n_crops, n_files, seed)
+        csv_result = measure_in_subprocess(_measure_plant_database_load, "csv", folder_path)
+        compile_result = measure_in_subprocess(_measure_plant_database_compile, folder_path)
+        compiled_result = measure_in_subprocess(_measure_plant_database_load, "compiled", folder_path)
+    finally:
+        shutil.rmtree(folder_path, ignore_errors=True)
+    print(f"Plant database, {n_rows} rows:")
+    print(f"  CSV parse:      load {csv_result['load_seconds']:.2f}s, load+optimum {csv_result['total_seconds']:.2f}s, "
+          f"peak RSS +{csv_result['peak_rss_mb'] - csv_result['baseline_rss_mb']:.0f} MB over imports")
+    print(f"  compiled table: load+optimum {compiled_result['total_seconds']:.4f}s, "
+          f"peak RSS +{compiled_result['peak_rss_mb'] - compiled_result['baseline_rss_mb']:.0f} MB over imports")
+    print(f"  compile step:   {compile_result['seconds']:.1f}s, "
+          f"peak RSS +{compile_result['peak_rss_mb'] - compile_result['baseline_rss_mb']:.0f} MB over imports")
+    return {"n_rows": n_rows, "csv": csv_result, "compiled": compiled_result, "compile": compile_result}
+
+def _measure_streaming_aggregation(mode, folder_path, chunk_rows, results):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "stream":
+        app.stream_optimal_conditions(folder_path, chunk_rows, write_counts=False)
+    else:
+        df = app.load_local_crop_datasets(folder_path)
+        app.count_plants(df)
+        app.compute_optimal_conditions(df)
+    peak = peak_rss_mb()
+    results.put({"seconds": time.perf_counter() - start, "peak_rss_mb": peak, "rss_delta_mb": peak - baseline})
+
+def benchmark_streaming(row_counts=(1_000_000, 10_000_000, 100_000_000), n_crops=1000, n_files=10,
+                        chunk_rows=app.STREAM_CHUNK_ROWS, in_memory_max_rows=10_000_000, seed=0):
+    # Peak RSS of the streaming aggregation should stay flat as the input grows; the
+    # in-memory path is measured alongside for sizes small enough not to exhaust RAM.
+    runs = []
+    for n_rows in row_counts:
+        folder_path = tempfile.mkdtemp(prefix="plant_stream_bench_")
+        try:
+            print(f"Writing synthetic database: {n_rows} rows, {n_crops} crops, {n_files} files...")
+            write_synthetic_plant_database(folder_path, n_rows, n_crops, n_files, seed)
+            run = {"n_rows": n_rows,
+                   "stream": measure_in_subprocess(_measure_streaming_aggregation, "stream", folder_path, chunk_rows)}
+            if n_rows <= in_memory_max_rows:
+                run["in_memory"] = measure_in_subprocess(_measure_streaming_aggregation, "memory", folder_path,
+                                                         chunk_rows)
+            runs.append(run)
+        finally:
+            shutil.rmtree(folder_path, ignore_errors=True)
+    print(f"Streaming aggregation, {chunk_rows} rows per chunk:")
+    for run in runs:
+        line = (f"  {run['n_rows']:>11,} rows: stream {run['stream']['seconds']:.1f}s, "
+                f"peak RSS {run['stream']['peak_rss_mb']:.0f} MB (+{run['stream']['rss_delta_mb']:.0f} over imports)")
+        if "in_memory" in run:
+            line += (f" | in-memory {run['in_memory']['seconds']:.1f}s, "
+                     f"peak RSS {run['in_memory']['peak_rss_mb']:.0f} MB "
+                     f"(+{run['in_memory']['rss_delta_mb']:.0f})")
+        print(line)
+    peaks = [run["stream"]["peak_rss_mb"] for run in runs]
+    # Flat within 50% (plus 64 MB of allocator noise) of the smallest input counts as bounded.
+    bounded = max(peaks) <= min(peaks) * 1.5 + 64
+    print(f"{'✅' if bounded else '⚠️'} Streaming peak RSS went from {min(peaks):.0f} to {max(peaks):.0f} MB "
+          f"across {row_counts[0]:,}-{row_counts[-1]:,} rows")
+    return {"runs": runs, "bounded": bounded}
+
+def run_startup_probe(code, module_path=app.__file__, importtime=False):
+    # A fresh interpreter per probe so nothing is already imported or warmed.
+    import subprocess  # local import
+    directory = os.path.dirname(os.path.abspath(module_path))
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(command, cwd=directory, capture_output=True, text=True)
+
+def import_time_breakdown(module_path=app.__file__):
+    # Parses `python -X importtime` output into (package, cumulative ms) for every module
+    # this file imports directly, plus the wall time of the whole import.
+    module = os.path.splitext(os.path.basename(module_path))[0]
+    result = run_startup_probe(f"import time; start = time.perf_counter(); import {module}; "
+                               f"print(time.perf_counter() - start)", module_path, importtime=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    children, breakdown, self_ms = [], [], 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            if name.strip() == module:
+                breakdown, self_ms = children, int(self_us) / 1000
+            children = []
+        elif depth == 1:
+            children.append((name.strip(), int(cumulative_us) / 1000))
+    breakdown.sort(key=lambda item: -item[1])
+    return {"import_seconds": float(result.stdout.split()[-1]), "module_self_ms": self_ms, "imports": breakdown}
+
+def time_to_window(module_path=app.__file__):
+    # Seconds from interpreter start of the import to the first painted App window, or None
+    # when no display is available.
+    module = os.path.splitext(os.path.basename(module_path))[0]
+    result = run_startup_probe(f"import time; start = time.perf_counter(); import {module}; app = {module}.App(); "
+                               f"app.update(); print(time.perf_counter() - start); app.destroy()", module_path)
+    return float(result.stdout.split()[-1]) if result.returncode == 0 and result.stdout.strip() else None
+
+def benchmark_startup(runs=5, top=12):
+    import_runs = [import_time_breakdown() for _ in range(runs)]
+    median_run = sorted(import_runs, key=lambda run: run["import_seconds"])[runs // 2]
+    window_runs = [seconds for seconds in (time_to_window() for _ in range(runs)) if seconds is not None]
+    print(f"Startup, median of {runs} fresh interpreters:")
+    print(f"  import: {median_run['import_seconds'] * 1000:.0f} ms "
+          f"(module body {median_run['module_self_ms']:.0f} ms)")
+    for name, cumulative_ms in median_run["imports"][:top]:
+        print(f"    {name:<28} {cumulative_ms:8.1f} ms")
+    if window_runs:
+        print(f"  first window painted: {np.median(window_runs) * 1000:.0f} ms")
+    else:
+        print("  first window: skipped (no display available)")
+    return {"import": latency_summary([run["import_seconds"] for run in import_runs]),
+            "window": latency_summary(window_runs) if window_runs else None,
+            "imports": median_run["imports"]}
+
+def synthetic_plant_names(n_names, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    words = ["".join(rng.choice(letters, size=rng.integers(3, 10))).capitalize() for _ in range(max(n_names // 30, 50))]
+    names = set()
+    while len(names) < n_names:
+        names.add(" ".join(rng.choice(words, size=rng.integers(1, 4))))
+    return list(names)
+
+def benchmark_search(n_names=100_000, n_queries=200, seed=0):
+    names = synthetic_plant_names(n_names, seed)
+    start = time.perf_counter()
+    index = app.PlantSearchIndex(names)
+    build_seconds = time.perf_counter() - start
+    # Replay typing sessions: each query grows one character at a time, as keystrokes do.
+    rng = np.random.default_rng(seed + 1)
+    index_times, scan_times = [], []
+    for name in rng.choice(index.lowered, size=n_queries):
+        offset = int(rng.integers(0, max(len(name) - 3, 1)))
+        for end in range(offset + 1, min(offset + 8, len(name)) + 1):
+            query = name[offset:end]
+            start = time.perf_counter()
+            index.search(query)
+            index_times.append(time.perf_counter() - start)
+            if len(scan_times) < 200:
+                start = time.perf_counter()
+                [plant for plant in index.names if query in str(plant).lower()]
+                scan_times.append(time.perf_counter() - start)
+    index_ms = np.array(index_times) * 1000
+    scan_ms = np.array(scan_times) * 1000
+    print(f"Plant search, {n_names} names (index built in {build_seconds:.2f}s):")
+    print(f"  indexed search: p50 {np.percentile(index_ms, 50):.3f} ms, p99 {np.percentile(index_ms, 99):.3f} ms, "
+          f"max {index_ms.max():.3f} ms per keystroke")
+    print(f"  substring scan: p50 {np.percentile(scan_ms, 50):.2f} ms per keystroke")
+    return {"n_names": n_names, "build_seconds": build_seconds,
+            "index_ms_p50": float(np.percentile(index_ms, 50)), "index_ms_p99": float(np.percentile(index_ms, 99)),
+            "scan_ms_p50": float(np.percentile(scan_ms, 50))}
+
+# ----------------------- Benchmark Suite -----------------------
+
+BENCHMARK_RESULTS_PATH = os.path.join(os.path.expanduser("~"), ".gardener_cache", "benchmarks.jsonl")
+BENCHMARK_REGRESSION_TOLERANCE = 0.25
+# Synthetic databases are (rows, crops, files); the rest are call counts per benchmark.
+BENCHMARK_SCALES = {
+    "quick": {"databases": [(100_000, 100, 4), (200_000, 1000, 8)], "repeat": 3, "crops": 1000,
+              "scoring_calls": 200, "location_calls": 20, "batch_points": 80,
+              "service_requests": 2000},
+    "full": {"databases": [(1_000_000, 1000, 10), (5_000_000, 10000, 20)], "repeat": 3, "crops": 10000,
+             "scoring_calls": 1000, "location_calls": 100, "batch_points": 500,
+             "service_requests": 20000}
+}
+
+def latency_summary(durations, items=None):
+    # Percentiles of per-call latency; throughput counts items (rows, points) when given.
+    durations = np.asarray(durations, dtype=np.float64)
+    total = float(durations.sum())
+    items = len(durations) if items is None else items
+    p50, p90, p99 = (float(v) * 1000 for v in np.percentile(durations, [50, 90, 99]))
+    return {"calls": len(durations), "p50_ms": p50, "p90_ms": p90, "p99_ms": p99,
+            "max_ms": float(durations.max()) * 1000, "throughput_per_sec": items / total if total else 0.0}
+
+def time_calls(func, args_list):
+    durations = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def benchmark_service_requests(folder_path, n_requests, clients=8, seed=0):
+    # Drives top_k over keep-alive HTTP connections against an in-process ServiceServer.
+    import http.client  # local import
+    model = app.RecommendationModel(folder_path)
+    server = app.ServiceServer(app.RecommendationService(model), port=0)
+    threading.Thread(target=server.serve_forever, name="service-bench", daemon=True).start()
+    readings = synthetic_sensor_readings(n_requests, seed + 2)
+    durations = [0.0] * n_requests
+    def client(worker):
+        connection = http.client.HTTPConnection(*server.server_address)
+        for i in range(worker, n_requests, clients):
+            body = json.dumps({"jsonrpc": "2.0", "id": i, "method": "top_k",
+                               "params": {"sensor": dict(zip(app.SENSOR_KEYS, readings[i].tolist()))}})
+            start = time.perf_counter()
+            connection.request("POST", "/rpc", body, {"Content-Type": "application/json"})
+            response = json.loads(connection.getresponse().read())
+            durations[i] = time.perf_counter() - start
+            if "error" in response:
+                raise RuntimeError(response["error"]["message"])
+        connection.close()
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            list(executor.map(client, range(clients)))
+    finally:
+        server.shutdown()
+        server.server_close()
+    elapsed = time.perf_counter() - start
+    summary = latency_summary(durations)
+    summary["throughput_per_sec"] = n_requests / elapsed
+    return summary
+
+def synthetic_locations(n_points, seed=0):
+    rng = np.random.default_rng(seed)
+    return [(round(float(lat), 4), round(float(lon), 4))
+            for lat, lon in zip(rng.uniform(-60, 60, n_points), rng.uniform(-180, 180, n_points))]
+
+def synthetic_field_points(n_points, spread_km=3.0, center=(41.88, -93.10), seed=0):
+    # A dense field: points scattered within spread_km of one centre.
+    rng = np.random.default_rng(seed)
+    offsets = rng.uniform(-spread_km, spread_km, size=(n_points, 2)) / app.KM_PER_DEGREE
+    lats = center[0] + offsets[:, 0]
+    lons = center[1] + offsets[:, 1] / cos(radians(center[0]))
+    return [(round(float(lat), 5), round(float(lon), 5)) for lat, lon in zip(lats, lons)]
+
+def benchmark_spatial_reuse(n_points=500, spread_km=3.0, latency=0.05, workers=app.BATCH_WORKERS, seed=0):
+    # Location reports for a dense field against the stub server, with and without reuse.
+    points = synthetic_field_points(n_points, spread_km, seed=seed)
+    runs = {}
+    for mode, radii in (("fetch", {}), ("reuse", None)):
+        server = StubProviderServer(latency=latency, seed=seed).start()
+        try:
+            with stub_providers(server):
+                index = app.SpatialIndex(path=None, radii=radii)
+                app.set_spatial_index(index)
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    reports = list(executor.map(lambda point: app.get_location_report(point[0], point[1], 6, 2023),
+                                                points))
+                elapsed = time.perf_counter() - start
+        finally:
+            server.stop()
+        distances = [distance for report in reports for distance in report.sources.values()]
+        runs[mode] = {"seconds": elapsed, "requests": server.requests, "requests_per_point": server.requests / n_points,
+                      "reuse_rate": index.hit_rate(), "max_source_km": max(distances, default=0.0),
+                      "incomplete": sum(1 for report in reports if report.missing_sensor_keys())}
+    print(f"Spatial reuse, {n_points} points within {spread_km} km, {latency * 1000:.0f} ms stub latency:")
+    for mode, run in runs.items():
+        print(f"  {mode:>5}: {run['seconds']:.1f}s, {run['requests']} requests "
+              f"({run['requests_per_point']:.2f} per point), {run['reuse_rate']:.0%} lookups reused, "
+              f"farthest source {run['max_source_km']:.2f} km, {run['incomplete']} incomplete")
+    return runs
+
+def run_benchmark_suite(scale="quick", latency=0.05, failure_rate=0.0, seed=0):
+    import platform  # local import
+    config = BENCHMARK_SCALES[scale]
+    repeat = config["repeat"]
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="gardener_bench_")
+    try:
+        for n_rows, n_crops, n_files in config["databases"]:
+            label = f"{n_rows}x{n_crops}x{n_files}"
+            folder_path = write_synthetic_plant_database(os.path.join(work_dir, label), n_rows, n_crops, n_files, seed)
+            durations, df = [], None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                df = app.load_local_crop_datasets(folder_path)
+                durations.append(time.perf_counter() - start)
+            results[f"load_local_crop_datasets[{label}]"] = latency_summary(durations, n_rows * repeat)
+            durations = time_calls(app.compute_optimal_conditions, [(df,)] * repeat)
+            results[f"compute_optimal_conditions[{label}]"] = latency_summary(durations, n_rows * repeat)
+            del df
+        results["startup_import"] = latency_summary([import_time_breakdown()["import_seconds"]
+                                                     for _ in range(repeat)])
+        window_times = [seconds for seconds in (time_to_window() for _ in range(repeat)) if seconds is not None]
+        if window_times:
+            results["startup_window"] = latency_summary(window_times)
+        optimal_conditions = synthetic_optimal_conditions(config["crops"], seed)
+        readings = [dict(zip(app.SENSOR_KEYS, row)) for row in synthetic_sensor_readings(config["scoring_calls"], seed + 1)]
+        durations = time_calls(app.recommend_crop, [(reading, optimal_conditions, app.DEFAULT_SIGMAS, app.DEFAULT_WEIGHTS)
+                                                for reading in readings])
+        results[f"recommend_crop[{config['crops']} crops]"] = latency_summary(durations)
+        # The scorer is built once, as callers holding a table do; only scoring is timed.
+        scorer = app.CropScorer.from_optimal_conditions(optimal_conditions, app.DEFAULT_SIGMAS, app.DEFAULT_WEIGHTS)
+        durations = time_calls(app.recommend_top_crops, [(reading, scorer) for reading in readings])
+        results[f"recommend_top_crops[{config['crops']} crops]"] = latency_summary(durations)
+        server = StubProviderServer(latency, latency * 0.4, failure_rate, seed).start()
+        try:
+            locations = synthetic_locations(config["location_calls"] + config["batch_points"], seed)
+            with stub_providers(server):
+                durations = time_calls(app.get_location_info, [(lat, lon, 6, 2023)
+                                                           for lat, lon in locations[:config["location_calls"]]])
+                results["get_location_info"] = latency_summary(durations)
+            with stub_providers(server):
+                input_path = os.path.join(work_dir, "batch_points.csv")
+                output_path = os.path.join(work_dir, "batch_scores.csv")
+                pd.DataFrame([{"lat": lat, "lon": lon, "month": 6, "year": 2023}
+                              for lat, lon in locations[config["location_calls"]:]]).to_csv(input_path, index=False)
+                folder_path = os.path.join(work_dir, "{}x{}x{}".format(*config["databases"][0]))
+                batch = app.run_batch(input_path, output_path, folder_path)
+                results["run_batch"] = {"calls": batch["points"], "seconds": batch["seconds"],
+                                        "throughput_per_sec": batch["points_per_sec"]}
+                durations = time_calls(app.planting_calendar, [(lat, lon, folder_path, 2023)
+                                                           for lat, lon in locations[:config["location_calls"]]])
+                results["planting_calendar"] = latency_summary(durations)
+                results["service_top_k"] = benchmark_service_requests(folder_path, config["service_requests"],
+                                                                       seed=seed)
+        finally:
+            server.stop()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "scale": scale,
+        "stub": {"latency": latency, "failure_rate": failure_rate, "seed": seed},
+        "environment": {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+                        "machine": platform.machine(), "system": platform.system(), "cpus": os.cpu_count()},
+        "results": results
+    }
+
+def read_benchmark_history(path=BENCHMARK_RESULTS_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare_benchmark_runs(current, baseline, tolerance=BENCHMARK_REGRESSION_TOLERANCE):
+    # Slower p50 latency or lower throughput beyond the tolerance counts as a regression.
+    regressions = []
+    for name, metrics in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        if "p50_ms" in metrics and metrics["p50_ms"] > previous["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {previous['p50_ms']:.2f} -> {metrics['p50_ms']:.2f} ms")
+        if metrics["throughput_per_sec"] < previous["throughput_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_per_sec']:.1f} -> "
+                               f"{metrics['throughput_per_sec']:.1f}/s")
+    return regressions
+
+def benchmark_suite(scale="quick", latency=0.05, failure_rate=0.0, results_path=BENCHMARK_RESULTS_PATH,
+                    tolerance=BENCHMARK_REGRESSION_TOLERANCE):
+    run = run_benchmark_suite(scale, latency, failure_rate)
+    print(f"Benchmark suite ({scale}, stub latency {latency * 1000:.0f} ms, failure rate {failure_rate:.0%}):")
+    for name, metrics in run["results"].items():
+        if "p50_ms" in metrics:
+            print(f"  {name}: p50 {metrics['p50_ms']:.2f} ms, p90 {metrics['p90_ms']:.2f} ms, "
+                  f"p99 {metrics['p99_ms']:.2f} ms, {metrics['throughput_per_sec']:,.1f}/s")
+        else:
+            print(f"  {name}: {metrics['calls']} in {metrics['seconds']:.2f}s, {metrics['throughput_per_sec']:,.1f}/s")
+    # Compare against the last run with the same scale and stub settings, then append this one.
+    comparable = [entry for entry in read_benchmark_history(results_path)
+                  if entry.get("scale") == run["scale"] and entry.get("stub") == run["stub"]]
+    regressions = compare_benchmark_runs(run, comparable[-1], tolerance) if comparable else []
+    for regression in regressions:
+        print(f"⚠️ Regression: {regression}")
+    if comparable and not regressions:
+        print(f"✅ No regressions against the run from {comparable[-1]['timestamp']}")
+    os.makedirs(os.path.dirname(results_path) or ".", exist_ok=True)
+    with open(results_path, "a") as f:
+        f.write(json.dumps(run) + "\n")
+    print(f"Results appended to {results_path}")
+    return run, regressions
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+# The repository root holds the benchmarks package, whose import puts the app script
+# (Gardener/Assets.xcassets/Full_test.dataset/Full_test.py) on sys.path as well.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import benchmarks  # noqa: E402,F401
+
+import Full_test as app  # noqa: E402
+from benchmarks.suite import synthetic_optimal_conditions  # noqa: E402
+
+@pytest.fixture
+def optimal_conditions():
+    return synthetic_optimal_conditions(200, seed=3)
+
+@pytest.fixture
+def scorer(optimal_conditions):
+    return app.CropScorer.from_optimal_conditions(optimal_conditions, app.DEFAULT_SIGMAS, app.DEFAULT_WEIGHTS)
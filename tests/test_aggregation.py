@@ -0,0 +1,79 @@
+import math
+import os
+
+import pytest
+
+import Full_test as app
+from benchmarks.suite import measure_in_subprocess, write_synthetic_plant_database, _measure_streaming_aggregation
+
+CHUNK_ROWS = 997  # deliberately not a divisor of the file sizes
+
+@pytest.fixture
+def folder(tmp_path):
+    return write_synthetic_plant_database(str(tmp_path / "plants"), 20_000, 30, 3, seed=2)
+
+def assert_same_optima(actual, expected):
+    # Values are parsed as float32, so the in-memory and streamed paths agree to float32 precision.
+    assert list(actual) == list(expected)
+    for crop, entry in expected.items():
+        for key, value in entry.items():
+            if math.isnan(value):
+                assert math.isnan(actual[crop][key])
+            else:
+                assert actual[crop][key] == pytest.approx(value, rel=1e-6, abs=1e-6)
+
+def test_streamed_optima_match_in_memory(folder):
+    streamed = app.stream_optimal_conditions(folder, CHUNK_ROWS, write_counts=False)
+    df = app.load_local_crop_datasets(folder)
+    expected = app.compute_optimal_conditions(df, learn_sigmas=True)
+    total_plants, counts = app.count_plants(df)
+    assert streamed["total_plants"] == total_plants
+    assert streamed["counts"] == counts
+    # The synthetic database has no Pressure column, so P_opt and sigma_P are NaN when streamed.
+    assert_same_optima({crop: {key: entry[key] for key in expected[crop]}
+                        for crop, entry in streamed["optimal"].items()}, expected)
+
+def test_cached_and_compiled_optima_match_streamed(folder):
+    streamed = app.stream_optimal_conditions(folder, CHUNK_ROWS, write_counts=False)
+    computed = app.load_optimal_conditions(folder)
+    cached = app.load_optimal_conditions(folder)
+    assert cached["fingerprint"] == computed["fingerprint"]
+    assert_same_optima(cached["optimal"], computed["optimal"])
+    app.compile_plant_database(folder, chunk_rows=CHUNK_ROWS)
+    assert app.get_plant_database(folder).optimum_entry() is not None
+    compiled = app.load_optimal_conditions(folder)
+    for entry in (cached, compiled):
+        assert entry["total_plants"] == streamed["total_plants"]
+        assert entry["counts"] == streamed["counts"]
+        assert_same_optima(entry["optimal"], streamed["optimal"])
+
+def test_readonly_load_writes_nothing(folder, tmp_path):
+    before = sorted(p.relative_to(tmp_path) for p in tmp_path.rglob("*"))
+    entry = app.load_optimal_conditions(folder, readonly=True)
+    assert entry["total_plants"] == 20_000
+    assert sorted(p.relative_to(tmp_path) for p in tmp_path.rglob("*")) == before
+
+def test_streaming_peak_memory_is_bounded(tmp_path):
+    # Eight times the rows must not grow the streaming peak RSS beyond allocator noise.
+    deltas = []
+    for n_rows in (100_000, 800_000):
+        folder = write_synthetic_plant_database(str(tmp_path / str(n_rows)), n_rows, 200, 2)
+        result = measure_in_subprocess(_measure_streaming_aggregation, "stream", folder, 20_000)
+        deltas.append(result["rss_delta_mb"])
+    assert deltas[1] <= deltas[0] * 1.5 + 16
+
+def test_first_writable_call_saves_a_readonly_load(folder, monkeypatch):
+    scanned = []
+    file_crop_statistics = app.file_crop_statistics
+    monkeypatch.setattr(app, "file_crop_statistics",
+                        lambda path, *args: scanned.append(path) or file_crop_statistics(path, *args))
+    model = app.get_recommendation_model(folder, readonly=True)
+    assert not os.path.exists(os.path.join(folder, app.OPTIMAL_CACHE_DIRNAME))
+    scorer = model.state["scorer"]
+    assert app.get_recommendation_model(folder) is model
+    # The caches are written from the statistics the warm-up computed; nothing is rescanned.
+    assert len(scanned) == 3
+    assert model.state["scorer"] is scorer and not model.state["readonly"]
+    assert os.path.exists(os.path.join(folder, "plant_count.txt"))
+    assert app.load_optimal_conditions(folder, readonly=True)["total_plants"] == 20_000
+    assert len(scanned) == 3
@@ -0,0 +1,25 @@
+import pandas as pd
+
+import Full_test as app
+from benchmarks.stub_server import StubProviderServer, stub_providers
+from benchmarks.suite import synthetic_field_points, write_synthetic_plant_database
+
+def test_batch_reports_response_cache_and_traces_it(tmp_path, capsys):
+    folder = write_synthetic_plant_database(str(tmp_path / "plants"), 2000, 10, 2)
+    points = synthetic_field_points(6, spread_km=0.2)
+    pd.DataFrame([{"lat": lat, "lon": lon, "month": 6, "year": 2023} for lat, lon in points] * 2).to_csv(
+        tmp_path / "points.csv", index=False)
+    server = StubProviderServer(latency=0.0, jitter=0.0).start()
+    tracer = app.enable_tracing()
+    try:
+        with stub_providers(server):
+            app.run_batch(str(tmp_path / "points.csv"), str(tmp_path / "scores.csv"), folder, workers=2)
+            counters = tracer.summary()["counters"]
+            tracer.report()
+    finally:
+        app.disable_tracing()
+        server.stop()
+    output = capsys.readouterr().out
+    assert output.count("Response cache:") == 2  # once from run_batch, once in the tracer report
+    assert counters.get("response_cache.store", 0) > 0
+    assert counters.get("response_cache.miss", 0) > 0
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import Full_test as app
+from benchmarks.stub_server import StubProviderServer, stub_providers
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_top_k_rows_non_positive_k_is_empty(k):
+    scores = np.random.default_rng(0).random((4, 7))
+    index, score = app.top_k_rows(scores, k)
+    assert index.shape == (4, 0) and index.dtype == np.intp
+    assert score.shape == (4, 0) and score.dtype == np.float64
+
+@pytest.mark.parametrize("k", [0, -3])
+def test_rank_non_positive_k_is_empty(scorer, k):
+    readings = np.array([[20, 60, 1010, 20, 100, 6.5], [5, 30, 990, 5, 40, 5.0]])
+    best_index, _, top_index, top_score = scorer.rank(readings, k)
+    assert best_index.shape == (2,)
+    assert top_index.shape == (2, 0) and top_score.shape == (2, 0)
+
+def test_sea_level_pressure_is_identity_at_sea_level():
+    pressure = np.array([1000.0, 1013.25])
+    assert np.allclose(app.sea_level_pressure(pressure, 0.0, np.array([10.0, np.nan])), pressure)
+
+@pytest.mark.parametrize("elevation", [0.0, 3500.0])
+def test_calendar_pressure_is_reduced_to_sea_level(scorer, elevation):
+    # The stub reports the standard-atmosphere station pressure for the point's elevation
+    # (about 658 hPa at 3500 m); the calendar should score sea-level pressure instead.
+    server = StubProviderServer(latency=0.0, jitter=0.0, elevation=elevation).start()
+    try:
+        with stub_providers(server):
+            result = app.planting_calendar(27.99, 86.93, year=2023, k=3, scorer=scorer)
+    finally:
+        server.stop()
+    pressures = [month["sensor"]["P"] for month in result["months"]]
+    assert all(abs(pressure - 1013.25) < 20 for pressure in pressures)
+    assert all(len(month["top_crops"]) == 3 for month in result["months"])
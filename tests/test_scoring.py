@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pytest
+
+import Full_test as app
+from benchmarks.suite import synthetic_sensor_readings
+
+def stable_top_k(scores, k, min_score=None):
+    # Reference ordering: a full stable descending sort, NaN and below-threshold scores dropped.
+    order = np.argsort(-scores, kind="stable")
+    keep = [i for i in order if not np.isnan(scores[i]) and (min_score is None or scores[i] >= min_score)]
+    return keep[:max(k, 0)]
+
+def tied_scores(shape, seed):
+    # Few distinct values so ties at the k-th score are common, plus some NaN.
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 6, size=shape) / 5
+    scores[rng.random(shape) < 0.1] = np.nan
+    return scores
+
+def test_vectorized_scores_match_plant_fitness(optimal_conditions, scorer):
+    readings = synthetic_sensor_readings(25, seed=4)
+    expected = np.array([[app.plant_fitness(dict(zip(app.SENSOR_KEYS, row)), optimal,
+                                            app.DEFAULT_SIGMAS, app.DEFAULT_WEIGHTS)
+                          for optimal in optimal_conditions.values()] for row in readings])
+    assert scorer.crops == list(optimal_conditions)
+    np.testing.assert_allclose(scorer.score(readings), expected, rtol=1e-9, atol=1e-12)
+
+def test_recommend_top_crops_matches_scalar_ranking(optimal_conditions):
+    sensor = dict(zip(app.SENSOR_KEYS, synthetic_sensor_readings(1, seed=5)[0]))
+    scalar = np.array([app.plant_fitness(sensor, optimal, app.DEFAULT_SIGMAS, app.DEFAULT_WEIGHTS)
+                       for optimal in optimal_conditions.values()])
+    crops = list(optimal_conditions)
+    shortlist = app.recommend_top_crops(sensor, optimal_conditions, k=7)
+    assert [crop for crop, _ in shortlist] == [crops[i] for i in stable_top_k(scalar, 7)]
+
+@pytest.mark.parametrize("k", [-1, 0, 1, 3, 10, 40, 100])
+@pytest.mark.parametrize("min_score", [None, 0.5])
+def test_top_k_indices_matches_stable_sort(k, min_score):
+    for seed in range(20):
+        scores = tied_scores(40, seed)
+        assert app.top_k_indices(scores, k, min_score).tolist() == stable_top_k(scores, k, min_score)
+
+@pytest.mark.parametrize("k", [1, 3, 10, 40, 100])
+@pytest.mark.parametrize("min_score", [None, 0.5])
+def test_top_k_rows_matches_stable_sort(k, min_score):
+    scores = tied_scores((60, 40), seed=7)
+    index, values = app.top_k_rows(scores, k, min_score)
+    assert index.shape == values.shape == (60, min(k, 40))
+    for row in range(len(scores)):
+        expected = stable_top_k(scores[row], k, min_score)
+        padded = expected + [-1] * (index.shape[1] - len(expected))
+        assert index[row].tolist() == padded
+        np.testing.assert_array_equal(values[row, :len(expected)], scores[row, expected])
+        assert np.isnan(values[row, len(expected):]).all()
+
+def test_rank_matches_top_k_rows(scorer):
+    readings = synthetic_sensor_readings(30, seed=6)
+    best_index, best_score, top_index, top_score = scorer.rank(readings, 5)
+    scores = scorer.score(readings)
+    expected_index, expected_score = app.top_k_rows(scores, 5)
+    np.testing.assert_array_equal(top_index, expected_index)
+    np.testing.assert_array_equal(top_score, expected_score)
+    np.testing.assert_array_equal(best_index, top_index[:, 0])
+    np.testing.assert_array_equal(best_score, top_score[:, 0])
+
+def test_empty_inputs(scorer):
+    assert app.top_k_indices(np.array([]), 3).shape == (0,)
+    assert app.top_k_indices(np.array([np.nan, np.nan]), 3).shape == (0,)
+    index, values = app.top_k_rows(np.empty((0, 5)), 3)
+    assert index.shape == values.shape == (0, 3)
+    best_index, best_score, top_index, top_score = scorer.rank(np.empty((0, len(app.SENSOR_KEYS))), 3)
+    assert best_index.shape == best_score.shape == (0,)
+    assert top_index.shape == top_score.shape == (0, 3)
+
+def test_parallel_workers_start_with_single_threaded_blas(optimal_conditions, scorer):
+    readings = synthetic_sensor_readings(50, seed=10)
+    saved = {var: os.environ.get(var) for var in app.BLAS_THREAD_VARIABLES}
+    with app.ParallelScorer.from_scorer(scorer, workers=2, shard_rows=10) as parallel:
+        parallel.start()
+        assert [parallel.pool.submit(os.getenv, var).result() for var in app.BLAS_THREAD_VARIABLES] == ["1"] * 4
+        ranked = parallel.rank(readings, 3)
+    assert {var: os.environ.get(var) for var in app.BLAS_THREAD_VARIABLES} == saved
+    for actual, expected in zip(ranked, scorer.rank(readings, 3)):
+        np.testing.assert_array_equal(actual, expected)
@@ -0,0 +1,61 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import Full_test as app
+from benchmarks.suite import synthetic_sensor_readings, write_synthetic_plant_database
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    folder = write_synthetic_plant_database(str(tmp_path_factory.mktemp("plants")), 4000, 25, 2)
+    return app.RecommendationService(app.RecommendationModel(folder))
+
+def rpc(service, method, params, request_id=1):
+    return json.loads(service.handle_payload(json.dumps(
+        {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})))
+
+def test_recommend_many_matches_recommend(service):
+    readings = [dict(zip(app.SENSOR_KEYS, row.tolist())) for row in synthetic_sensor_readings(5, seed=8)]
+    many = rpc(service, "recommend_many", {"readings": readings})["result"]
+    single = [rpc(service, "recommend", {"sensor": reading})["result"] for reading in readings]
+    assert [result["crop"] for result in many] == [result["crop"] for result in single]
+    assert [result["fitness"] for result in many] == pytest.approx([result["fitness"] for result in single])
+
+def test_recommend_many_empty_readings(service):
+    assert service.model.recommend_many([]) == []
+    assert rpc(service, "recommend_many", {"readings": []}) == {"jsonrpc": "2.0", "id": 1, "result": []}
+
+def test_top_k_zero(service):
+    reading = dict(zip(app.SENSOR_KEYS, synthetic_sensor_readings(1, seed=9)[0].tolist()))
+    assert rpc(service, "top_k", {"sensor": reading, "k": 0})["result"] == []
+
+def test_empty_batch_is_invalid_request(service):
+    response = json.loads(service.handle_payload("[]"))
+    assert response["id"] is None
+    assert response["error"]["code"] == -32600
+
+def test_batch_of_notifications_returns_nothing(service):
+    notification = {"jsonrpc": "2.0", "method": "status"}
+    assert service.handle_payload(json.dumps([notification, notification])) is None
+
+def test_failed_notification_gets_no_reply(service):
+    payload = {"jsonrpc": "2.0", "method": "recommend", "params": {}}
+    assert service.handle_payload(json.dumps(payload)) is None
+    assert service.handle_payload(json.dumps({"jsonrpc": "2.0", "method": "no_such_method"})) is None
+    # Without a method string it is an invalid request rather than a notification.
+    assert json.loads(service.handle_payload(json.dumps({"jsonrpc": "2.0"})))["error"]["code"] == -32600
+
+def test_fresh_model_reuses_recorded_hashes(service, monkeypatch):
+    hashed = []
+    hash_file = app.hash_file
+    monkeypatch.setattr(app, "hash_file", lambda path, *args: hashed.append(path) or hash_file(path, *args))
+    model = app.RecommendationModel(service.model.folder_path)
+    assert hashed == []
+    assert model.state["digest"] == service.model.state["digest"]
+
+def test_concurrent_first_calls_share_one_model(tmp_path):
+    folder = write_synthetic_plant_database(str(tmp_path / "plants"), 2000, 10, 2)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        models = list(executor.map(lambda _: app.get_recommendation_model(folder), range(4)))
+    assert all(model is models[0] for model in models)